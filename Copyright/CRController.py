@@ -3,10 +3,12 @@ Description: This file contains the classes for implementing the copyright page
 Author: Andrew Lucentini :-)
 '''
 from Copyright.CRView import CopyrightView
+from Misc.Tracing import traced
 
 """
 Copyright page controller
 """
+@traced
 class CopyrightController():
 	def __init__(self, parent, mainController):
 		self.mainController = mainController
@@ -4,9 +4,7 @@ Author: Andrew Lucentini :-)
 '''
 import tkinter as tk
 from tkinter import ttk
-from itertools import cycle
 import Misc.Styling as st
-from PIL import ImageTk, Image
 
 """
 Class for creating the copyright page
@@ -4,12 +4,12 @@ Author: Andrew Lucentini :-)
 '''
 import tkinter as tk
 from MainView import MainView
-from MechanicalWorkshop.MWController import MechanicalWorkshopController
-from Thermocouple.TCController import ThermocoupleController
-from Copyright.CRController import CopyrightController
+from Misc.Startup import preload
+from Misc.Tracing import traced
 """
 The main simulation controller
 """
+@traced
 class MainController(tk.Tk):
     def __init__(self, *args, **kwargs):
         tk.Tk.__init__(self, *args, **kwargs)
@@ -19,18 +19,14 @@ class MainController(tk.Tk):
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
-        # Initialize Mechanical workshop page
-        self.Page1 = MechanicalWorkshopController(container, self)
-        self.Page1.page1.grid(row=0, column=0, sticky="nsew")
-        self.Page1.page2.grid(row=0, column=0, sticky="nsew")
-
-        # Initialize thermocouple page
-        self.Page2 = ThermocoupleController(container, self)
-        self.Page2.page1.grid(row=0, column=0, sticky="nsew")
-
-        # Initialize copyright page
-        self.copyright = CopyrightController(container, self)
-        self.copyright.page1.grid(row=0, column=0, sticky="nsew")
+        # Pages are built the first time they are shown, most sessions only open one of them
+        self.container = container
+        self.pageFactories = {
+            0: self.buildMechanicalWorkshop,
+            1: self.buildThermocouple,
+            2: self.buildCopyright,
+        }
+        self.pages = {}
 
         # Initialize main view
         self.HomePage = MainView(container, self)
@@ -42,16 +38,44 @@ class MainController(tk.Tk):
         self.HomePage.pages[2].configure(command = lambda: self.show_frame(2))
         self.HomePage.tkraise()
 
+        # Load the modules of the pages while the user reads the home page
+        self.after(100, preload)
+
+    def buildMechanicalWorkshop(self):
+        """
+        Initialize Mechanical workshop page
+        """
+        from MechanicalWorkshop.MWController import MechanicalWorkshopController
+        controller = MechanicalWorkshopController(self.container, self)
+        controller.page1.grid(row=0, column=0, sticky="nsew")
+        controller.page2.grid(row=0, column=0, sticky="nsew")
+        return controller
+
+    def buildThermocouple(self):
+        """
+        Initialize thermocouple page
+        """
+        from Thermocouple.TCController import ThermocoupleController
+        controller = ThermocoupleController(self.container, self)
+        controller.page1.grid(row=0, column=0, sticky="nsew")
+        return controller
+
+    def buildCopyright(self):
+        """
+        Initialize copyright page
+        """
+        from Copyright.CRController import CopyrightController
+        controller = CopyrightController(self.container, self)
+        controller.page1.grid(row=0, column=0, sticky="nsew")
+        return controller
+
     def show_frame(self, page):
         """
-        Show a given page
+        Show a given page, building it first if it was never shown
         """
-        if page == 0:
-            self.Page1.page1.tkraise()
-        elif page == 1:
-            self.Page2.page1.tkraise()
-        else:
-            self.copyright.page1.tkraise()
+        if page not in self.pages:
+            self.pages[page] = self.pageFactories[page]()
+        self.pages[page].page1.tkraise()
 
     def mainPage(self):
         """
@@ -5,8 +5,7 @@ Author: Andrew Lucentini :-)
 import tkinter as tk
 import Misc.Styling as st
 from tkinter import ttk
-from PIL import ImageTk, Image
-from Misc.helperFunctions import from_rgb
+from Misc.Assets import assets
 '''
 Class to create the main view
 '''
@@ -72,7 +71,7 @@ class MainView(tk.Frame):
 
 		
 		# Draw mac logo
-		logoImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"macLogo.png"))
+		logoImg = assets.photo("macLogo.png") # Tk reads PNG itself until PIL is loaded
 		canvas = tk.Canvas(mainArea, bg=st.MAIN_AREA_BG, width=130, height=71, bd=0, highlightthickness=0, relief='ridge')
 		canvas.create_image(130/2,71/2, image=logoImg, anchor = "center")
 		canvas.image = logoImg
@@ -0,0 +1,93 @@
+'''
+Description: This file contains a stateless batch API for the tensile test model. It computes
+			the material properties and full stress-strain curves for many coldwork values at once
+			and writes them to disk.
+'''
+import io
+import os
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from MechanicalWorkshop.MWModel import ALUMINUM, materialProperties, tensileCurve
+
+# Results of a coldwork sweep. CW, YS, UTS and EL have shape (N,), the curves have shape (N, points)
+SweepResult = namedtuple('SweepResult', ['CW', 'YS', 'UTS', 'EL', 'strain', 'stress', 'trueStress'])
+
+def sweepColdWork(CW, s1Points=60, s2_s3Points=100, material=ALUMINUM, E=69000):
+	"""
+	Compute YS, UTS, EL and the whole tensile curve for every coldwork value in CW.
+	Every curve is sampled with the same number of points so they can be stacked in 2-D arrays
+	"""
+	CW = np.atleast_1d(np.asarray(CW, dtype=np.float64))
+	YS, UTS, EL = materialProperties(CW, **material)
+	curve = tensileCurve(YS, UTS, EL, s1Points, s2_s3Points, E)
+	return SweepResult(CW, YS, UTS, EL, curve.strain, curve.stress, curve.trueStress)
+
+def saveSweep(result, path):
+	"""
+	Write a sweep to path. A .npz path stores one array per field, anything else is written
+	as CSV with one row per coldwork value: CW, YS, UTS, EL, the strains and then the stresses
+	"""
+	if str(path).endswith('.npz'):
+		np.savez(path, **result._asdict())
+		return
+	points = result.strain.shape[1]
+	header = ['CW', 'YS', 'UTS', 'EL']
+	header += ['strain_%d' % i for i in range(points)]
+	header += ['stress_%d' % i for i in range(points)]
+	table = np.column_stack([result.CW, result.YS, result.UTS, result.EL, result.strain, result.stress])
+	np.savetxt(path, table, delimiter=',', header=','.join(header), comments='', fmt='%.10g')
+
+def _gridChunk(axes, CW, start, stop):
+	"""
+	Compute the properties of grid combinations start to stop for every coldwork value.
+	Runs in a worker process and returns the rows, one per (combination, CW) pair, already
+	formatted as CSV so the parent only has to write the bytes
+	"""
+	index = np.arange(start, stop)
+	params = [axis[i] for axis, i in zip(axes, np.unravel_index(index, [len(a) for a in axes]))]
+	YS, UTS, EL = materialProperties(CW[None, :], *[p[:, None] for p in params])
+	rows = len(index)*len(CW)
+	table = np.column_stack([np.repeat(index, len(CW))] + [np.repeat(p, len(CW)) for p in params] +
+		[np.tile(CW, len(index)), YS.reshape(rows), UTS.reshape(rows), EL.reshape(rows)])
+	text = io.BytesIO()
+	np.savetxt(text, table, delimiter=',', fmt=['%d']+['%.10g']*(table.shape[1]-1))
+	return text.getvalue()
+
+def sweepMaterialGrid(grid, CW, path, chunkSize=100000, workers=None):
+	"""
+	Sweep the material parameters over the Cartesian product of the values in grid, a dict from
+	parameter name (see ALUMINUM) to values. Parameters missing from grid keep their aluminum value.
+	The rows are computed and formatted in chunks of about chunkSize rows (never less than one
+	combination, len(CW) rows) spread over a process pool, and each chunk is appended to the CSV
+	file at path as soon as it finishes, so rows are not in combination order.
+	Returns the number of combinations
+	"""
+	unknown = set(grid)-set(ALUMINUM)
+	if unknown:
+		raise ValueError("Unknown material parameters: "+", ".join(sorted(unknown)))
+	names = list(ALUMINUM)
+	axes = [np.atleast_1d(np.asarray(grid.get(n, ALUMINUM[n]), dtype=np.float64)) for n in names]
+	CW = np.atleast_1d(np.asarray(CW, dtype=np.float64))
+	if not len(CW):
+		raise ValueError("CW must hold at least one coldwork value")
+	total = int(np.prod([len(a) for a in axes]))
+	workers = workers or os.cpu_count() or 1
+	combinations = max(chunkSize//len(CW), 1) # Each combination gives one row per coldwork value
+	chunks = iter(range(0, total, combinations))
+
+	with open(path, 'wb') as f, ProcessPoolExecutor(max_workers=workers) as pool:
+		f.write((','.join(['index']+names+['CW', 'YS', 'UTS', 'EL'])+'\n').encode())
+		# Only keep a couple of chunks per worker in flight so memory stays bounded
+		pending = set()
+		while True:
+			for start in chunks:
+				pending.add(pool.submit(_gridChunk, axes, CW, start, min(start+combinations, total)))
+				if len(pending) >= 2*workers:
+					break
+			if not pending:
+				break
+			finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+			for future in finished:
+				f.write(future.result())
+	return total
@@ -2,13 +2,19 @@
 Description: This file contains the class for the mechanical workshop controller.
 Author: Andrew Lucentini :-)
 '''
-from MechanicalWorkshop.MWModel import TensileTestModel
+from MechanicalWorkshop.MWModel import TensileTestModel, coldWork
 from MechanicalWorkshop.MWView import TensileTestView, ColdRollerView
+from Misc.Scheduling import AnimationClock, Coalescer
+from Misc.Profiling import FrameTimer, PerformanceOverlay
+from Misc.Tracing import traced
 import tkinter as tk
+import atexit
+import os
 
 """
 Controller for the mechanical workshop simulation
 """
+@traced
 class MechanicalWorkshopController():
 	def __init__(self, parent, mainController):
 		self.mainController = mainController
@@ -28,8 +34,10 @@ class MechanicalWorkshopController():
 		# Page 1 variables
 		self.cr_running = False	 	 # Flag for determining if simulation is running
 		self.cr_finished = False 	 # Flag for determining if simulation 		
+		self.cr_paused = False		 # Flag for determining if simulation was paused part way
 		self.CW = None				 # Percent coldwork. Variable is set by next function call
-		self.calculateColdWork(None) # Get initial slider values
+		self.applyColdWork()		 # Get initial slider values
+		self.coldWorkInput = Coalescer(self.page1, self.applyColdWork) # Slider events are applied once per burst
 
 		# Page 2 button bindings
 		self.page2.animationButton.bind("<Button>", self.tt_AnimationController)
@@ -39,9 +47,27 @@ class MechanicalWorkshopController():
 		# Page 2 variables
 		self.tt_running = False	 # Flag for determining if simulation is running
 		self.tt_finished = False # Flag for determining if simulation completed			
+		self.tt_paused = False	 # Flag for determining if simulation was paused part way
 
 		self.animationRate = 25  # FPS of animations
 
+		# Clocks that advance the animations by real elapsed time. Set a duration (seconds)
+		# to make an animation take that long regardless of machine speed, main.py sets them
+		# with --roll-duration and --tensile-duration through MLS_ROLL_DURATION and MLS_TENSILE_DURATION
+		self.cr_clock = AnimationClock(self.animationRate/1000)
+		self.tt_clock = AnimationClock(self.animationRate/1000)
+		self.cr_duration = float(os.environ['MLS_ROLL_DURATION']) if os.environ.get('MLS_ROLL_DURATION') else None
+		self.tt_duration = float(os.environ['MLS_TENSILE_DURATION']) if os.environ.get('MLS_TENSILE_DURATION') else None
+
+		# Per-frame timing, shown on the animation canvases with F3. Set MLS_FRAME_LOG to a
+		# path to write the recorded frames to a CSV file on exit
+		self.frameTimer = FrameTimer()
+		self.cr_overlay = PerformanceOverlay(self.page1.animationWindow, self.frameTimer)
+		self.tt_overlay = PerformanceOverlay(self.page2.animationWindow, self.frameTimer)
+		self.page1.bind_all('<F3>', self.toggleOverlay)
+		if os.environ.get('MLS_FRAME_LOG'):
+			atexit.register(self.frameTimer.exportCSV, os.environ['MLS_FRAME_LOG'])
+
 	def pressArrow(self, event):
 		"""
 		Change the arrows if the user presses them
@@ -68,12 +94,22 @@ class MechanicalWorkshopController():
 		"""
 		Controller for playing and pausing the coldroller animation 
 		"""
+		self.coldWorkInput.flush() # Apply any slider change still waiting
+		if self.CW > 90:
+			return # The change disabled the button, don't start
 		if self.cr_running:
 			self.cr_running = False
+			self.cr_paused = True
 			self.page1.animationButton.config(text='Resume')
 		else:
 			if self.cr_finished:			
 				self.cr_finished = False
+			if self.cr_paused:
+				self.cr_clock.resume()
+			else:
+				self.cr_clock.start(self.page1.coldRoller.totalSteps, self.cr_duration)
+			self.frameTimer.restart()
+			self.cr_paused = False
 			self.cr_running = True
 			self.cr_SimulationLoop()
 			self.page1.animationButton.config(text='Pause')
@@ -99,6 +135,7 @@ class MechanicalWorkshopController():
 		"""
 		if self.tt_running:
 			self.tt_running = False
+			self.tt_paused = True
 			self.page2.animationButton.config(text='Resume')
 
 			# Allow the user to leave if they pause the simulation
@@ -116,6 +153,12 @@ class MechanicalWorkshopController():
 			self.page2.nextPage.unbind('<ButtonRelease-1>')
 
 			# Start the simulation again
+			if self.tt_paused:
+				self.tt_clock.resume()
+			else:
+				self.tt_clock.start(self.model.numPoints, self.tt_duration)
+			self.frameTimer.restart()
+			self.tt_paused = False
 			self.tt_running = True
 			self.tt_SimulationLoop()
 			self.page2.animationButton.config(text='Pause')
@@ -125,12 +168,21 @@ class MechanicalWorkshopController():
 		Simulation loop for performing cold rolling animation
 		"""
 		if self.cr_running:
-			done = self.page1.updateAnimation()	# Update animation
+			done = False
+			self.frameTimer.beginFrame()
+			steps = self.cr_clock.tick()	# Number of steps due, more than 1 if frames were dropped
+			if steps:
+				done = self.page1.updateAnimation(steps)	# Update animation
+				self.frameTimer.mark('canvas')
+				self.frameTimer.endFrame(steps-1)
+				self.cr_overlay.update()
 			if done:
 				YS, UTS = self.model.setParameters(self.CW) # Set paramaters based on coldwork
 				self.page2.setCW(self.CW)					# Send the CW to the tensile test page
 				xBounds, yBounds = self.model.init_simVariables(YS, UTS)
 				self.page2.setGraphSize(xBounds, yBounds)
+				curve = self.model.curve
+				self.page2.setKeyframes(curve.strain, curve.width, curve.neckWidth, curve.neckHeight)
 				self.cr_running = False
 				self.cr_finished = True
 				self.page1.animationButton.config(text='Start')
@@ -151,16 +203,25 @@ class MechanicalWorkshopController():
 				self.page1.homeButton.config(state='normal') 	
 				self.page1.homeButton.bind("<ButtonRelease-1>",self.exitPage) 	
 			else:
-				self.page1.after(self.animationRate,self.cr_SimulationLoop) # Call this function again
+				self.page1.after(self.cr_clock.nextDelay(),self.cr_SimulationLoop) # Call this function again
 
 	def tt_SimulationLoop(self):
 		"""
 		Simulation loop for performing tensile test animation
 		"""
 		if self.tt_running:
-			xvals, yvals, elongation, guageWidth, neckWidth, neckHeight, done = self.model.updateModel() # Update model
-			self.page2.updateAnimation(elongation, guageWidth, neckWidth, neckHeight)				  	 # Update animation
-			self.page2.updateGraph(xvals, yvals) 	# Update graph
+			done = False
+			self.frameTimer.beginFrame()
+			steps = self.tt_clock.tick()	# Number of steps due, more than 1 if frames were dropped
+			if steps:
+				xvals, yvals, elongation, guageWidth, neckWidth, neckHeight, done = self.model.updateModel(steps) # Update model
+				self.frameTimer.mark('model')
+				self.page2.showFrame(self.model.curPoint-1)	# Update animation, the rod of every point is precomputed
+				self.frameTimer.mark('canvas')
+				self.page2.updateGraph(xvals, yvals) 	# Update graph
+				self.frameTimer.mark('plot')
+				self.frameTimer.endFrame(steps-1)
+				self.tt_overlay.update()
 			if done:
 				EL = self.model.getFractureOffset()
 				self.page2.generateFracture(EL) 	# Display a 'fracture' based on elongation
@@ -173,9 +234,23 @@ class MechanicalWorkshopController():
 				self.page2.nextPage.bind('<ButtonPress-1>',self.pressArrow)
 				self.page2.nextPage.bind('<ButtonRelease-1>',self.releaseArrowPage2)
 			else:
-				self.page2.after(self.animationRate,self.tt_SimulationLoop)
+				self.page2.after(self.tt_clock.nextDelay(),self.tt_SimulationLoop)
+
+	def toggleOverlay(self, event):
+		"""
+		Show or hide the frame timing overlay on both pages
+		"""
+		self.cr_overlay.toggle()
+		self.tt_overlay.toggle()
 
 	def calculateColdWork(self,event):
+		"""
+		Callback for the t_0 and t_f sliders. Sliders can fire hundreds of events per second,
+		so the coldwork is only recalculated once the burst of events has been handled
+		"""
+		self.coldWorkInput()
+
+	def applyColdWork(self):
 		"""
 		Calculate the coldwork percentage based on slider values.
 		If the slider is modified the next page button is disabled
@@ -197,7 +272,7 @@ class MechanicalWorkshopController():
 		t_0 = self.page1.t_0.get()
 		t_f = self.page1.t_f.get()
 
-		self.CW = round((t_0-t_f)/t_0*100,2)	# Calculate coldwork
+		self.CW = coldWork(t_0, t_f)			# Calculate coldwork
 		self.page1.updateCWText(str(self.CW))	# Display coldwork on page
 		self.page1.moveRollers(t_f*6, t_0*6, self.CW)	# Move rollers based on t_f and t_0
 
@@ -223,6 +298,7 @@ class MechanicalWorkshopController():
 		Reset simulation to default
 		"""
 		self.tt_running = False
+		self.tt_paused = False
 		xvals, yvals = self.model.resetData()
 		self.page2.updateGraph(xvals,yvals)		# Update graph with data
 		self.page2.resetCanvas()				# Reset canvas for drawing rod
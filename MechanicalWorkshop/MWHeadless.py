@@ -0,0 +1,42 @@
+'''
+Description: This file contains a headless runner for the mechanical workshop. It performs the
+			cold rolling and the tensile test using only the models, so it does not need tkinter,
+			PIL or a display.
+'''
+import numpy as np
+from collections import namedtuple
+from MechanicalWorkshop.MWModel import TensileTestModel, coldWork
+
+# Results of one simulation. The last five fields have one entry per animation frame
+SimulationResult = namedtuple('SimulationResult',
+	['CW', 'YS', 'UTS', 'EL', 'strain', 'stress', 'width', 'neckWidth', 'neckHeight'])
+
+def simulate(t_0, t_f, model=None, tolerance=None):
+	"""
+	Cold roll a sheet from t_0 to t_f (mm) and run the tensile test on it.
+	Applies the same limits as the cold roller page. If tolerance (MPa) is given
+	the curve is sampled adaptively instead of with the page's fixed point counts
+	"""
+	if not (t_0 > 0 and t_f > 0): # Also rejects NaN
+		raise ValueError("t_0 and t_f must be greater than 0")
+	if t_f > t_0:
+		raise ValueError("t_f cannot be greater than t_0")
+	CW = coldWork(t_0, t_f)
+	if CW > 90:
+		raise ValueError("Coldwork cannot be greater than 90%")
+
+	model = model or TensileTestModel()
+	model.tolerance = tolerance
+	YS, UTS = model.setParameters(CW)
+	model.init_simVariables(YS, UTS)
+	c = model.curve
+	return SimulationResult(CW, YS, UTS, model.EL, c.strain, c.stress, c.width, c.neckWidth, c.neckHeight)
+
+def saveSimulation(result, path):
+	"""
+	Write the frames of a simulation to a CSV file. The material properties go in the header
+	"""
+	header = "CW=%s,YS=%.6g,UTS=%.6g,EL=%.6g\nstrain,stress,width,neckWidth,neckHeight" % (
+		result.CW, result.YS, result.UTS, result.EL)
+	table = np.column_stack([result.strain, result.stress, result.width, result.neckWidth, result.neckHeight])
+	np.savetxt(path, table, delimiter=',', header=header, fmt='%.10g')
@@ -4,14 +4,257 @@ Author: Andrew Lucentini :-)
 		Dr. Zurob Hatem (zurobh@mcmaster.ca)
 		Dr. Bosco Yu (bosco.yu@mcmaster.ca)
 '''
+import math
 import random
-from math import exp, log
+import numpy as np
+from collections import namedtuple, OrderedDict
+
+# Material parameters based on aluminum
+ALUMINUM = {
+	'YS_0': 60,
+	'YS_INF': 220,
+	'CW_C': 45,
+	'UTS_0': 110,
+	'UTS_INF': 223,
+	'M_EL': 0.0045,
+	'C_EL': 0.01,
+}
+
+# Smallest tolerance (MPa) of adaptiveCurve. Below it the curve needs millions of points
+MIN_TOLERANCE = 1e-6
+
+# Whole tensile curve. Every field is an array with one entry per animation frame
+TensileCurve = namedtuple('TensileCurve', ['strain', 'stress', 'trueStress', 'width', 'neckWidth', 'neckHeight'])
+
+def coldWork(t_0, t_f):
+	"""
+	Percent coldwork of rolling a sheet from thickness t_0 down to t_f
+	"""
+	return round((t_0-t_f)/t_0*100,2)
+
+def materialProperties(CW, YS_0, YS_INF, CW_C, UTS_0, UTS_INF, M_EL, C_EL):
+	"""
+	Yield strength, UTS and elongation for a given coldwork. Every argument may be an array,
+	the results are broadcast together
+	"""
+	CW = np.asarray(CW, dtype=np.float64)
+	YS = YS_INF-(YS_INF-YS_0)*np.exp(-CW/CW_C)
+	UTS = UTS_INF-(UTS_INF-UTS_0)*np.exp(-CW/CW_C)
+	EL = 1/(M_EL*CW+C_EL)/100
+	return YS, UTS, EL
+
+def tensileCurve(YS, UTS, EL, s1Points, s2_s3Points, E=69000):
+	"""
+	Compute every point of the tensile test in one batched call, with s1Points evenly spaced
+	points in stage 1 and s2_s3Points+1 in stage 2 and 3. YS, UTS and EL may be arrays,
+	in which case each field has shape (len(YS), s1Points+s2_s3Points+1)
+	"""
+	s1 = np.arange(s1Points)/s1Points
+	s2_s3 = np.arange(s2_s3Points+1)/s2_s3Points
+	necking = np.arange(s2_s3Points+1) > int(s2_s3Points*.60) # Points past the necking point
+	return sampledCurve(YS, UTS, EL, s1, s2_s3, necking, E)
+
+def sampledCurve(YS, UTS, EL, s1, s2_s3, necking, E=69000):
+	"""
+	Compute the tensile curve at the given samples. s1 holds the stage 1 points as fractions
+	of YS, s2_s3 the stage 2 and 3 points as fractions of EL and necking marks the stage 3 points
+	"""
+	YS = np.asarray(YS, dtype=np.float64)[..., None]
+	UTS = np.asarray(UTS, dtype=np.float64)[..., None]
+	EL = np.asarray(EL, dtype=np.float64)[..., None]
+	ELmult = 1.2*EL
+	ELfact = EL/6
+	UTS_YS_diff = UTS-YS
+	s1Points = len(s1)
+
+	# Stage 1 of curve
+	s1Stress = YS*s1
+	s1Strain = s1Stress/E
+
+	# Stage 2 and 3 of curve
+	pl_strain = EL*s2_s3
+	hardening = UTS-UTS_YS_diff*np.exp(-pl_strain/ELfact)
+	s2_s3Stress = np.where(necking, UTS-UTS_YS_diff*np.exp((pl_strain-ELmult)/ELfact), hardening)
+	s2_s3Strain = s2_s3Stress/E+pl_strain
+
+	# Join both stages along the last axis
+	shape = np.broadcast_shapes(YS.shape, UTS.shape, EL.shape)[:-1]
+	join = lambda s1Vals, s2_s3Vals: np.concatenate([
+		np.broadcast_to(s1Vals, shape+s1Vals.shape[-1:]),
+		np.broadcast_to(s2_s3Vals, shape+s2_s3Vals.shape[-1:])], axis=-1)
+	stress = join(s1Stress, s2_s3Stress)			 # Engineering Stress
+	trueStress = join(s1Stress, hardening)			 # True Stress
+	strain = join(s1Strain, s2_s3Strain)
+	w = np.exp(-np.log(1+strain))					 # Relative guage uniform width
+	n = join(w[..., :s1Points], w[..., s1Points:]*(s2_s3Stress/hardening)) # Relative remaining neck width
+	a = (w-n)*1.5 # relative elipse width
+	b = 5*a		# ellipse height
+	return TensileCurve(strain, stress, trueStress, w, a, b)
+
+def _chordError(h):
+	"""
+	Largest distance between exp(-u) and its chord over [0, h]
+	"""
+	if h < 1e-2:
+		# The closed form below cancels for short chords, use its series instead
+		return h*h/8*(1+h*(-1/2+h*(11/72+h*(-5/144+h*41/6480))))
+	t = -math.log(-math.expm1(-h)/h) # Where the chord is furthest from the curve
+	return -math.expm1(-t)-t*math.exp(-t)
+
+def _longestStep(error, maxStep, tolerance):
+	"""
+	Longest step h <= maxStep with error(h) <= tolerance. error must grow with h, about as h^2
+	for short steps, so log(error) is solved against log(h) with the secant method
+	"""
+	e0 = error(maxStep)
+	if e0 <= tolerance:
+		return maxStep
+	e0 = math.log(e0/tolerance)
+	lo, hi = 0.0, maxStep # error(lo) <= tolerance < error(hi)
+	h0 = maxStep
+	h = maxStep*math.exp(-e0/2) # First guess from error ~ h^2
+	for i in range(50):
+		e = math.log(error(h)/tolerance)
+		if abs(e) < 1e-9:
+			return h if e <= 0 else h*math.exp(-e) # Step back from just over the tolerance
+		if e < 0:
+			lo = h
+		else:
+			hi = h
+		slope = (e-e0)/math.log(h/h0)
+		h0, e0 = h, e
+		h = h*math.exp(-e/slope) if slope > 0 else 0.0
+		if not lo < h < hi:
+			h = (lo+hi)/2 # Fall back to bisection if the secant step leaves the bracket
+	return lo
+
+def adaptiveCurve(YS, UTS, EL, tolerance, E=69000):
+	"""
+	Sample the tensile curve with the fewest points that keep the straight lines drawn between them
+	within tolerance (MPa) of the stress at every plastic strain. Stage 1 is a straight line and only
+	needs its start. Stage 2 and 3 are exponentials of u = pl_strain/ELfact, so the error of a chord
+	has a closed form and each step is made as long as the tolerance allows
+	"""
+	if not tolerance >= MIN_TOLERANCE:
+		raise ValueError("tolerance must be at least %g MPa" % MIN_TOLERANCE)
+	UTS_YS_diff = UTS-YS
+	neckU = 6*.60	# u at the necking point
+	endU = 6		# u at fracture
+
+	# Stage 2: UTS-diff*exp(-u), a chord over [u, u+h] is off by diff*exp(-u)*_chordError(h)
+	u = [0.0]
+	while u[-1] < neckU:
+		start = u[-1]
+		u.append(start+_longestStep(lambda h: UTS_YS_diff*math.exp(-start)*_chordError(h), neckU-start, tolerance))
+	necking = len(u)
+
+	# Stage 3: UTS-diff*exp(u-7.2), a chord over [u, u+h] is off by diff*exp(u+h-7.2)*_chordError(h)
+	while u[-1] < endU:
+		start = u[-1]
+		u.append(start+_longestStep(lambda h: UTS_YS_diff*math.exp(start+h-7.2)*_chordError(h), endU-start, tolerance))
+
+	s2_s3 = np.array(u)/6
+	return sampledCurve(YS, UTS, EL, np.zeros(1), s2_s3, np.arange(len(u)) >= necking, E)
+
+"""
+Preallocated buffer for the points of a curve. Points are written at a fill cursor and the
+filled part is exposed as views, so no memory is allocated while the simulation runs
+"""
+class CurveBuffer():
+	def __init__(self, capacity=0):
+		self.data = np.empty((2, capacity), dtype=np.float64)
+		self.size = 0 # Fill cursor
+
+	def resize(self, capacity):
+		"""
+		Make sure the buffer can hold capacity points. Rewinds the cursor
+		"""
+		if capacity > self.data.shape[1]:
+			self.data = np.empty((2, capacity), dtype=np.float64)
+		self.size = 0
+
+	def append(self, x, y):
+		"""
+		Write a point at the cursor and advance it
+		"""
+		self.data[0, self.size] = x
+		self.data[1, self.size] = y
+		self.size += 1
+
+	def extend(self, x, y):
+		"""
+		Write several points at the cursor and advance it
+		"""
+		n = len(x)
+		self.data[0, self.size:self.size+n] = x
+		self.data[1, self.size:self.size+n] = y
+		self.size += n
+
+	def reset(self):
+		"""
+		Rewind the cursor. The buffer memory is kept
+		"""
+		self.size = 0
+
+	@property
+	def x(self):
+		"""
+		View of the filled x values
+		"""
+		return self.data[0, :self.size]
+
+	@property
+	def y(self):
+		"""
+		View of the filled y values
+		"""
+		return self.data[1, :self.size]
+
+"""
+Bounded least recently used cache. Used to keep finished tensile curves so that
+repeating a coldwork setting does not recompute the curve
+"""
+class CurveCache():
+	def __init__(self, maxsize=32):
+		self.maxsize = maxsize
+		self.entries = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, key):
+		"""
+		Return the entry for key or None. Counts hits and misses
+		"""
+		entry = self.entries.get(key)
+		if entry is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.entries.move_to_end(key)
+		return entry
+
+	def put(self, key, entry):
+		"""
+		Store an entry, evicting the least recently used one if the cache is full
+		"""
+		self.entries[key] = entry
+		self.entries.move_to_end(key)
+		if len(self.entries) > self.maxsize:
+			self.entries.popitem(last=False)
+
+	def clear(self):
+		"""
+		Remove every entry and reset the counters
+		"""
+		self.entries.clear()
+		self.hits = 0
+		self.misses = 0
 
 """
 Model for the tensile test. This class contains the state of a tesnsile test
 at a given position in "time". The tensile test is split into 3 regions:
 The elastic region, the strain hardening, and then the necking region. The math
-for each region can be seen in the updateModel function
+for each region can be seen in the tensileCurve function
 """
 class TensileTestModel():
 	def __init__(self):
@@ -20,59 +263,76 @@ class TensileTestModel():
 		self.UTS = None # UTS constant in MPa
 		self.YS = None # Yield strength in MPa
 		self.EL = None # strain constant, unitless
+		self.CW = None # Coldwork the parameters were set for
+		self.tolerance = None # Max stress error (MPa) for adaptive sampling, None uses fixed point counts
+
+		# Finished curves keyed by rounded coldwork, material parameters and sampling resolution
+		self.cache = CurveCache()
 
 		# Data for simulation
-		self.Xvals = []
-		self.Yvals = []
+		self.data = CurveBuffer()
 
 		# Material parameters based on aluminum
-		self.YS_0 = 60
-		self.YS_INF = 220
-		self.CW_C = 45
-		self.UTS_0 = 110
-		self.UTS_INF = 223
-		self.M_EL = 0.0045
-		self.C_EL = 0.01
+		self.YS_0 = ALUMINUM['YS_0']
+		self.YS_INF = ALUMINUM['YS_INF']
+		self.CW_C = ALUMINUM['CW_C']
+		self.UTS_0 = ALUMINUM['UTS_0']
+		self.UTS_INF = ALUMINUM['UTS_INF']
+		self.M_EL = ALUMINUM['M_EL']
+		self.C_EL = ALUMINUM['C_EL']
 	
 	def setParameters(self, CW):
 		"""
 		Modify parameters based on coldwork
 		"""
-		self.YS = self.YS_INF-(self.YS_INF-self.YS_0)*exp(-CW/self.CW_C)
-		self.UTS = self.UTS_INF-(self.UTS_INF-self.UTS_0)*exp(-CW/self.CW_C)
-		self.EL = 1/(self.M_EL*CW+self.C_EL)
-		self.EL = self.EL/100
+		YS, UTS, EL = materialProperties(CW, self.YS_0, self.YS_INF, self.CW_C,
+			self.UTS_0, self.UTS_INF, self.M_EL, self.C_EL)
+		self.YS, self.UTS, self.EL = float(YS), float(UTS), float(EL)
+		self.CW = CW
 		return self.YS, self.UTS
 
 	def init_simVariables(self, YS, UTS):
 		"""
 		Initialize the simulation variables
 		"""
-		# Change number of points based on YS and UTS to make simulation run more smoothly
-		ratio = UTS/YS
-		if ratio > 1.5:
-			self.s1Points = 20		# Number of data points in stage 1
-			self.s2_s3Points = 100  # Number of data points in stage 2 and stage 3
-		elif ratio > 1.3:
-			self.s1Points = 40
-			self.s2_s3Points = 80
+		if self.tolerance is None:
+			# Change number of points based on YS and UTS to make simulation run more smoothly
+			ratio = UTS/YS
+			if ratio > 1.5:
+				self.s1Points = 20		# Number of data points in stage 1
+				self.s2_s3Points = 100  # Number of data points in stage 2 and stage 3
+			elif ratio > 1.3:
+				self.s1Points = 40
+				self.s2_s3Points = 80
+			else:
+				self.s1Points = 60
+				self.s2_s3Points = 40 
+			resolution = (self.s1Points, self.s2_s3Points)
+			makeCurve = lambda: tensileCurve(self.YS, self.UTS, self.EL, self.s1Points, self.s2_s3Points, self.E)
 		else:
-			self.s1Points = 60
-			self.s2_s3Points = 40 
-
-		# Stage 1 variables
-		self.s1CurPoint = 0
-		self.s1Inc = 1/self.s1Points # How much to incrememnt each point
+			resolution = (self.tolerance,)
+			makeCurve = lambda: adaptiveCurve(self.YS, self.UTS, self.EL, self.tolerance, self.E)
 
-		# Stage 2 and 3 variables
-		self.s2_s3CurPoint = 0
-		self.s2_s3Inc = 1/self.s2_s3Points 			  # How much to increment each point
-		self.neckingPoint = int(self.s2_s3Points*.60) # Point to transition from stage 2 to stage 3
-
-		# Constants
-		self.ELmult = 1.2*self.EL
-		self.ELfact = self.EL/6
-		self.UTS_YS_diff = self.UTS-self.YS
+		# Precompute the whole curve, updateModel only steps through it. Reuse it if this
+		# coldwork was simulated before with the same material parameters
+		key = None if self.CW is None else (round(self.CW, 2), self.YS_0, self.YS_INF, self.CW_C,
+			self.UTS_0, self.UTS_INF, self.M_EL, self.C_EL, self.E)+resolution
+		curve = None if key is None else self.cache.get(key)
+		if curve is None:
+			curve = makeCurve()
+			for values in curve:
+				values.flags.writeable = False # Cached arrays are shared
+			if key is not None:
+				self.cache.put(key, curve)
+		self.curve = curve
+		self.numPoints = len(self.curve.strain)
+		c = self.curve # Per point values as Python floats, cheaper to step through than the arrays
+		self.points = list(zip(c.strain.tolist(), c.stress.tolist(), c.width.tolist(), c.neckWidth.tolist(), c.neckHeight.tolist()))
+		self.curPoint = 0
+		if self.tolerance is not None:
+			self.s1Points = 1 # Stage 1 is a straight line
+			self.s2_s3Points = self.numPoints-2
+		self.data.resize(self.s1Points+self.s2_s3Points+1) # Stage 2 and 3 include their end point
 
 		return self.EL, self.UTS
 
@@ -80,12 +340,24 @@ class TensileTestModel():
 		"""
 		Resets the Simulation to default
 		"""
-		self.Xvals = []
-		self.Yvals = []
-		self.s1CurPoint = 0
-		self.s2_s3CurPoint = 0
+		self.data.reset()
+		self.curPoint = 0
 		return self.Xvals, self.Yvals
 
+	@property
+	def Xvals(self):
+		"""
+		Strain values of the points simulated so far
+		"""
+		return self.data.x
+
+	@property
+	def Yvals(self):
+		"""
+		Stress values of the points simulated so far
+		"""
+		return self.data.y
+
 	def getFractureOffset(self):
 		"""
 		Use the self.EL constant to determine fracture curvature.
@@ -93,45 +365,21 @@ class TensileTestModel():
 		"""
 		return self.EL
 
-	def updateModel(self):
-		"""
-		Function to update the state of the model. 
-		This function is called at a specific interval
-		"""
-		done = False
-		# Stage 1 of curve
-		if self.s1CurPoint < self.s1Points:
-			stress = self.YS*self.s1CurPoint*self.s1Inc # Engineering Stress
-			stress_true = stress # True Stress
-			total_strain = stress/self.E
-			self.s1CurPoint += 1
-			w = exp(-log(1+total_strain)) 		# Relative guage uniform width
-			n = w
-		# Stage 2 of curve
-		elif self.s2_s3CurPoint <= self.neckingPoint:
-			pl_strain = self.EL*self.s2_s3CurPoint*self.s2_s3Inc
-			stress = self.UTS-self.UTS_YS_diff*exp(-pl_strain/self.ELfact) # Engineering Stress
-			stress_true = stress # True Stress
-			tot_strain = stress/self.E
-			total_strain = tot_strain+pl_strain
-			self.s2_s3CurPoint += 1
-			w = exp(-log(1+total_strain)) 		# Relative guage uniform width
-			n = w
-		# Stage 3 of curve
-		elif self.s2_s3CurPoint <= self.s2_s3Points:
-			pl_strain = self.EL*self.s2_s3CurPoint*self.s2_s3Inc
-			stress = self.UTS-self.UTS_YS_diff*exp((pl_strain-self.ELmult)/self.ELfact) # Engineering Stress
-			stress_true = self.UTS-self.UTS_YS_diff*exp(-pl_strain/self.ELfact) # True Stress
-			tot_strain = stress/self.E
-			total_strain = tot_strain+pl_strain
-			self.s2_s3CurPoint += 1
-			w = exp(-log(1+total_strain)) 						# Relative guage uniform width
-			n = exp(-log(1+total_strain))*(stress/stress_true)	# Relative remaining neck width
-
-		a = (w-n)*1.5 # relative elipse width
-		b = 5*a		# ellipse height		
-		if self.s2_s3CurPoint > self.s2_s3Points: # Check if simulation is done
-			done = True		
-		self.Xvals.append(total_strain) # Update graph
-		self.Yvals.append(stress)
-		return self.Xvals, self.Yvals, total_strain, w, a, b, done
\ No newline at end of file
+	def updateModel(self, steps=1):
+		"""
+		Function to update the state of the model by stepping to the next precomputed point.
+		This function is called at a specific interval. Several points can be stepped at once
+		when frames are skipped, the returned state is the one of the last point
+		"""
+		start = self.curPoint
+		if steps == 1 and start < self.numPoints:
+			# One point per frame is the usual case, skip the slicing
+			strain, stress, width, neckWidth, neckHeight = self.points[start]
+			self.data.append(strain, stress)
+			self.curPoint = start+1
+			return self.Xvals, self.Yvals, strain, width, neckWidth, neckHeight, self.curPoint >= self.numPoints
+		self.curPoint = min(start+steps, self.numPoints)
+		done = self.curPoint >= self.numPoints # Check if simulation is done
+		self.data.extend(self.curve.strain[start:self.curPoint], self.curve.stress[start:self.curPoint]) # Update graph
+		strain, stress, width, neckWidth, neckHeight = self.points[self.curPoint-1]
+		return self.Xvals, self.Yvals, strain, width, neckWidth, neckHeight, done
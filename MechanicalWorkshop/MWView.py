@@ -5,10 +5,11 @@ Description: This file contains the classes necessary to create the pages for th
 Author: Andrew Lucentini :-)
 '''
 import tkinter as tk
+import numpy as np
 import Misc.Styling as st
-import Misc.helperFunctions as hf
+import Misc.arrayHelpers as ah
 from tkinter import ttk
-from PIL import Image, ImageTk
+from Misc.Assets import assets
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
@@ -101,9 +102,9 @@ class ColdRollerView(tk.Frame):
 		self.animationButton.grid(row=12, column=7, columnspan=4, rowspan=2, sticky='nsew')
 
 		# Buttons to go to next page
-		self.arrow = ImageTk.PhotoImage(file = st.IMG_PATH+"right_arrow.png")
-		self.arrowClicked = ImageTk.PhotoImage(file = st.IMG_PATH+"right_arrow_clicked.png")
-		self.arrowDisabled = ImageTk.PhotoImage(file = st.IMG_PATH+"right_arrow_disabled.png")
+		self.arrow = assets.photo("right_arrow.png")
+		self.arrowClicked = assets.photo("right_arrow_clicked.png")
+		self.arrowDisabled = assets.photo("right_arrow_disabled.png")
 
 		# Draw initial button
 		self.nextPage = tk.Button(mainArea, image=self.arrow, borderwidth=0)
@@ -115,7 +116,7 @@ class ColdRollerView(tk.Frame):
 		self.errMsg.grid(row = 16, column = 1, columnspan=10)
 
 		# Draw mac logo
-		logoImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"macLogo.png"))
+		logoImg = assets.photo("macLogo.png")
 		canvas = tk.Canvas(mainArea, bg=st.MAIN_AREA_BG, width=130, height=71, bd=0, highlightthickness=0, relief='ridge')
 		canvas.create_image(130/2,71/2, image=logoImg, anchor = "center")
 		canvas.image = logoImg
@@ -154,8 +155,8 @@ class ColdRollerView(tk.Frame):
 		"""
 		self.coldRoller.updateRollers(t_f,t_0, CW)
 
-	def updateAnimation(self):
-		done = self.coldRoller.updateAni()
+	def updateAnimation(self, steps=1):
+		done = self.coldRoller.updateAni(steps)
 		return done
 
 	def updateErrorMsg(self, errText):
@@ -217,18 +218,21 @@ class TensileTestView(tk.Frame):
 		self.a.set_ylabel('Stress (MPa)')
 		self.a.set_xlabel('Strain (-)')
 		self.line = self.a.plot([],[],"-")
+		self.segment = self.a.plot([],[],"-", color=self.line[0].get_color(), animated=True)[0] # Newest part of the line
+		self.drawn = 0 # Number of points already drawn on the canvas
+		self.lineSize = 0 # Number of points the full line holds, the rest were only blitted
+		self.xvals = self.yvals = None # Latest data, copied to the full line on full redraws
 		self.a.format_coord = lambda x, y: "Strain (-)={:6.4f}, Stress (MPa)={:6.3f}".format(x,y)
 
 		# Create canvas for plot
 		self.graphWindow = FigureCanvasTkAgg(self.f, mainArea)
 		self.graphWindow.get_tk_widget().grid(row=5,column=6, rowspan=12, columnspan=12)		
-		self.BG = self.graphWindow.copy_from_bbox(self.a.bbox)
-		self.OG = self.BG
+		self.graphWindow.mpl_connect('draw_event', self.drawLine)
 
 		# Load arrow images
-		self.arrow = ImageTk.PhotoImage(file = st.IMG_PATH+"left_arrow.png")
-		self.arrowClicked = ImageTk.PhotoImage(file = st.IMG_PATH+"left_arrow_clicked.png")
-		self.arrowDisabled = ImageTk.PhotoImage(file = st.IMG_PATH+"left_arrow_disabled.png")
+		self.arrow = assets.photo("left_arrow.png")
+		self.arrowClicked = assets.photo("left_arrow_clicked.png")
+		self.arrowDisabled = assets.photo("left_arrow_disabled.png")
 
 		# Arrow for previous page
 		self.nextPage = tk.Button(mainArea, image=self.arrow, borderwidth=0)
@@ -253,7 +257,7 @@ class TensileTestView(tk.Frame):
 		self.toolbar.grid(row = 17, column = 6, rowspan=2, columnspan=10, sticky='nsew')
 
 		# Draw mac logo
-		logoImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"macLogo.png"))
+		logoImg = assets.photo("macLogo.png")
 		canvas = tk.Canvas(mainArea, bg=st.MAIN_AREA_BG, width=130, height=71, bd=0, highlightthickness=0, relief='ridge')
 		canvas.create_image(130/2,71/2, image=logoImg, anchor = "center")
 		canvas.image = logoImg
@@ -265,8 +269,10 @@ class TensileTestView(tk.Frame):
 		"""
 		self.a.set_xlim([-0.01, x+0.3])
 		self.a.set_ylim([0, y+50])
+		self.line[0].set_data([],[])
+		self.lineSize = 0
+		self.drawn = 0
 		self.graphWindow.draw()
-		self.BG = self.graphWindow.copy_from_bbox(self.a.bbox)
 
 	def pressArrow(self):
 		"""
@@ -303,20 +309,55 @@ class TensileTestView(tk.Frame):
 
 	def updateGraph(self, xvals, yvals):
 		"""
-		Update the graph with xvals and yvals. This function is called at a given framerate
-		"""
-		self.line[0].set_data(xvals,yvals)
-		self.graphWindow.restore_region(self.BG)
-		self.a.draw_artist(self.line[0])
-		self.graphWindow.blit(self.a.bbox)
+		Update the graph with xvals and yvals. This function is called at a given framerate.
+		Only the points added since the last call are drawn on top of what is already on the
+		canvas, so a frame costs the same however long the curve is. If the data shrank (reset)
+		the whole graph is redrawn. Full redraws such as resizing or the toolbar draw the
+		complete line, see drawLine
+		"""
+		self.xvals, self.yvals = xvals, yvals
+		n = len(xvals)
+		if n < self.drawn:
+			self.line[0].set_data(xvals, yvals)
+			self.lineSize = n
+			self.drawn = n
+			self.graphWindow.draw()
+		elif n > self.drawn:
+			start = max(self.drawn-1, 0) # Start at the last drawn point so the segments join
+			self.segment.set_data(xvals[start:n], yvals[start:n])
+			self.a.draw_artist(self.segment)
+			self.graphWindow.blit(self.a.bbox)
+			self.drawn = n
 		self.graphWindow.flush_events()
 
+	def drawLine(self, event):
+		"""
+		Called after every full redraw. The points that were only blitted are copied to the full
+		line and drawn on top, so the line data is only copied when the whole graph is redrawn
+		"""
+		if self.drawn > self.lineSize:
+			self.line[0].set_data(self.xvals[:self.drawn], self.yvals[:self.drawn])
+			self.lineSize = self.drawn
+			self.a.draw_artist(self.line[0])
+
 	def updateAnimation(self, elongation, widthFact, neckWidthFact, neckHeightFact):
 		"""
 		Update the canvas based on given values. This function is called at a given framerate
 		"""
 		self.rod.updateRod(elongation, widthFact, neckWidthFact, neckHeightFact)
 
+	def setKeyframes(self, elongation, widthFact, neckWidthFact, neckHeightFact):
+		"""
+		Precompute the rod for every point of the tensile curve. Called once per curve
+		"""
+		self.rod.setKeyframes(elongation, widthFact, neckWidthFact, neckHeightFact)
+
+	def showFrame(self, frame):
+		"""
+		Show the rod at a point of the curve given to setKeyframes. This function is called at a given framerate
+		"""
+		self.rod.showFrame(frame)
+
 	def generateFracture(self, EL):
 		"""
 		Generate a fracture in the Rod. Function is called at the end of the animation
@@ -334,13 +375,16 @@ class ColdRollerGraphic():
 		self.width = canvasWidth
 
 		# Initialize roller images
-		self.t_rollermask = Image.open(st.IMG_PATH+"rollerTop.png")
-		self.b_rollermask = Image.open(st.IMG_PATH+"rollerBottom.png") 
-		self.img_mask = Image.open(st.IMG_PATH+"CW_75_to_90.png")
+		self.t_rollermask = assets.image("rollerTop.png")
+		self.b_rollermask = assets.image("rollerBottom.png")
+
+		# Decode the coldwork microstructure backgrounds once
+		self.backgrounds = {}
+		for name in ("CW_0_to_15.png", "CW_15_to_30.png", "CW_30_to_75.png", "CW_75_to_90.png"):
+			self.backgrounds[name] = assets.photo(name)
+		self.backgroundName = "CW_75_to_90.png"
 		# self.height = 315; self.width = 600
-		self.t_rollerimg = ImageTk.PhotoImage(self.t_rollermask.rotate(0))
-		self.b_rollerimg = ImageTk.PhotoImage(self.b_rollermask.rotate(0))
-		self.background_img = ImageTk.PhotoImage(self.img_mask)
+		self.background_img = self.backgrounds[self.backgroundName]
 		self.roller_radius = self.t_rollermask.size[0]/2
 
 		# Top roller coordinates. Coordinates are center of image
@@ -393,6 +437,17 @@ class ColdRollerGraphic():
 		self.sheetCount = 0
 		self.sheetInc = 4
 		self.rollerInc = 10
+		self.totalSteps = 720//self.rollerInc # Steps for 2 rotations
+
+		# Rotated roller sprites for every angle the animation reaches, built once
+		self.spriteStep = self.rollerInc
+		self.t_sprites = {}
+		self.b_sprites = {}
+		for angle in range(0, 360, self.spriteStep):
+			self.t_sprites[angle] = assets.photo("rollerTop.png", angle, lambda img, a=angle: img.rotate(a))
+			self.b_sprites[angle] = assets.photo("rollerBottom.png", -angle, lambda img, a=angle: img.rotate(-a))
+		self.t_rollerimg = self.t_sprites[0]
+		self.b_rollerimg = self.b_sprites[0]
 
 		# Keep track of t_f and t_0
 		self.t_f = 0
@@ -488,10 +543,10 @@ class ColdRollerGraphic():
 			newImg ="CW_30_to_75.png"
 		else:
 			newImg ="CW_75_to_90.png"
-		self.canvas.delete(self.backGround)
-		self.background_img = ImageTk.PhotoImage(Image.open(st.IMG_PATH+newImg))
-		self.backGround = self.canvas.create_image(0,0, image = self.background_img, anchor = 'nw')
-		self.canvas.tag_lower(self.backGround)
+		if newImg != self.backgroundName:
+			self.backgroundName = newImg
+			self.background_img = self.backgrounds[newImg]
+			self.canvas.itemconfig(self.backGround, image = self.background_img)
 
 		# Update roller positions
 		self.canvas.coords(self.topRoller, self.tr_x, self.tr_y-t_f)
@@ -515,34 +570,45 @@ class ColdRollerGraphic():
 		for i in (self.rightVertical, self.topRightHorizontal, self.bottomRightHorizontal):
 			self.canvas.coords(i, self.width/2, self.height/2, self.width/2, self.height/2)
 
-	def updateAni(self):
+	def approachRollers(self, sheetCount):
+		"""
+		Move the blocks and lines for a sheet position before the right side reaches the center of the rollers
+		"""
+		r_amount = self.x0_rb+sheetCount
+		self.canvas.coords(self.topRightBlock, self.x0_trb+sheetCount, self.y0_trb-self.t_f, self.x1_trb, self.y1_trb-self.t_f)
+		self.canvas.coords(self.bottomRightBlock, self.x0_brb+sheetCount, self.y0_brb+self.t_f, self.x1_brb, self.y1_brb+self.t_f)
+		self.canvas.coords(self.topLeftHorizontal, self.x1_lb+sheetCount, self.y1_tlb-self.t_0, self.x0_trb+sheetCount, self.y1_tlb-self.t_0)
+		self.canvas.coords(self.bottomLeftHorizontal, self.x1_lb+sheetCount, self.y0_blb+self.t_0, self.x0_brb+sheetCount, self.y0_blb+self.t_0)
+		self.canvas.coords(self.leftVertical, self.x1_lb+sheetCount, self.y1_tlb-self.t_0, self.x1_lb+sheetCount, self.y0_blb+self.t_0)
+		self.canvas.coords(self.farRightVertical, r_amount, self.y1_tlb-self.t_0, r_amount, self.y0_blb+self.t_0)
+
+	def updateAni(self, steps=1):
 		"""
-		Update the cold roller animation. This function is called at an interval
+		Update the cold roller animation. This function is called at an interval.
+		Several steps can be taken at once when frames are skipped
 		"""
-		self.rollerCount += self.rollerInc
-		self.sheetCount += self.sheetInc
-		x,y = self.canvas.coords(self.topRoller)
-		x1,y1 = self.canvas.coords(self.bottomRoller)
+		steps = min(steps, (720-self.rollerCount)//self.rollerInc)
+		previous = self.sheetCount
+		self.rollerCount += self.rollerInc*steps
+		self.sheetCount += self.sheetInc*steps
 
-		# Update the roller image by rotating it
-		self.canvas.delete(self.t_rollerimg)
-		self.canvas.delete(self.b_rollerimg)
-		self.t_rollerimg = ImageTk.PhotoImage(self.t_rollermask.rotate(self.rollerCount))
-		self.b_rollerimg = ImageTk.PhotoImage(self.b_rollermask.rotate(-self.rollerCount))
-		self.topRoller = self.canvas.create_image(x,y, image = self.t_rollerimg, anchor = tk.CENTER)
-		self.bottomRoller = self.canvas.create_image(x1,y1, image = self.b_rollerimg, anchor = tk.CENTER)
+		# Update the roller image by swapping in the sprite rotated to the current angle
+		angle = round(self.rollerCount/self.spriteStep)*self.spriteStep % 360
+		self.t_rollerimg = self.t_sprites[angle]
+		self.b_rollerimg = self.b_sprites[angle]
+		self.canvas.itemconfig(self.topRoller, image = self.t_rollerimg)
+		self.canvas.itemconfig(self.bottomRoller, image = self.b_rollerimg)
 
 		#  Move the blocks and lines a certain way if the right side hasn't gotten to the center of the rollers
 		r_amount = self.x0_rb+self.sheetCount
 		r_left_amount = self.x1_lb+self.sheetCount
 		if r_amount <= self.width/2:
-			self.canvas.coords(self.topRightBlock, self.x0_trb+self.sheetCount, self.y0_trb-self.t_f, self.x1_trb, self.y1_trb-self.t_f)
-			self.canvas.coords(self.bottomRightBlock, self.x0_brb+self.sheetCount, self.y0_brb+self.t_f, self.x1_brb, self.y1_brb+self.t_f)
-			self.canvas.coords(self.topLeftHorizontal, self.x1_lb+self.sheetCount, self.y1_tlb-self.t_0, self.x0_trb+self.sheetCount, self.y1_tlb-self.t_0)
-			self.canvas.coords(self.bottomLeftHorizontal, self.x1_lb+self.sheetCount, self.y0_blb+self.t_0, self.x0_brb+self.sheetCount, self.y0_blb+self.t_0)
-			self.canvas.coords(self.leftVertical, self.x1_lb+self.sheetCount, self.y1_tlb-self.t_0, self.x1_lb+self.sheetCount, self.y0_blb+self.t_0)
-			self.canvas.coords(self.farRightVertical, r_amount, self.y1_tlb-self.t_0, r_amount, self.y0_blb+self.t_0)
+			self.approachRollers(self.sheetCount)
 		else: 
+			# If skipped frames jumped past the center, first put the blocks where the last step before it leaves them
+			if self.x0_rb+previous <= self.width/2:
+				self.approachRollers(self.sheetInc*((self.width/2-self.x0_rb)//self.sheetInc))
+
 			# Move the blocks and lines a different way if the left side passed the center of the rollers
 			if r_left_amount >= self.width/2:
 				self.canvas.coords(self.topLeftHorizontal, self.width/2, self.y1_tlb-self.t_0, self.width/2, self.y1_tlb-self.t_0)
@@ -568,7 +634,7 @@ class ColdRollerGraphic():
 		# self.canvas.coords(self.leftVertical, self.x1_lb, self.y1_tlb-t_0, self.x1_lb, self.y0_blb+t_0)
 
 		# Stop the simulation when we reach 2 rotations
-		if self.rollerCount == 720:
+		if self.rollerCount >= 720:
 			self.rollerCount = 0
 			self.sheetCount = 0
 			self.count3 = 0
@@ -679,6 +745,24 @@ class Rod():
 		self.bg_x1 = self.width/2+self.gripWidth/2
 		self.bg_y1 = self.height/2+self.guageLength/2+self.gripLength+self.roundedLength
 
+		# Bounding boxes of every shape as one array, one row per shape in drawing order
+		self.baseBoxes = np.array([
+			[self.g_x0, self.g_y0, self.g_x1, self.g_y1],
+			[self.ln_x0, self.ln_y0, self.ln_x1, self.ln_y1],
+			[self.rn_x0, self.rn_y0, self.rn_x1, self.rn_y1],
+			[self.tb_x0, self.tb_y0, self.tb_x1, self.tb_y1],
+			[self.tlf_x0, self.tlf_y0, self.tlf_x1, self.tlf_y1],
+			[self.trf_x0, self.trf_y0, self.trf_x1, self.trf_y1],
+			[self.bb_x0, self.bb_y0, self.bb_x1, self.bb_y1],
+			[self.blf_x0, self.blf_y0, self.blf_x1, self.blf_y1],
+			[self.brf_x0, self.brf_y0, self.brf_x1, self.brf_y1],
+			[self.tg_x0, self.tg_y0, self.tg_x1, self.tg_y1],
+			[self.bg_x0, self.bg_y0, self.bg_x1, self.bg_y1]], dtype=np.float64)
+		self.stretchDir = np.array([0, 0, 0, -1, -1, -1, 1, 1, 1, -1, 1]) # Which way each shape moves with elongation
+		self.shown = [None]*len(self.baseBoxes) # Coordinates last sent to the canvas
+		self.keyframes = []	# Boxes of every frame of the current curve, see setKeyframes
+		self.items = []
+
 	def drawRod(self):
 		"""
 		Draw the rod
@@ -749,62 +833,69 @@ class Rod():
 			self.bg_x1, self.bg_y1,
 			fill = self.gripperColour, outline = '')
 
-	def updateRod(self, elongation, widthFact, neckWidthFact, neckHeightFact):
+		self.items = [self.guage, self.leftNeck, self.rightNeck,
+			self.topBlank, self.topLeftFillet, self.topRightFillet,
+			self.bottomBlank, self.bottomLeftFillet, self.bottomRightFillet,
+			self.topGrip, self.bottomGrip]
+		self.shown[:] = self.baseBoxes.tolist()
+
+	def rodBoxes(self, elongation, widthFact, neckWidthFact, neckHeightFact):
 		"""
-		Update the rod position based on initial drawing. Must be called after drawRod
+		Bounding boxes of every shape for the given values. Scalars give one (11, 4) array of boxes,
+		arrays of K values give a (K, 11, 4) table with the boxes of every frame
 		"""
-		e = elongation*50								# Scale longation pixels
+		e = np.multiply(elongation, 50)					# Scale longation pixels
 		eFact = (self.guageLength+2*e)/self.guageLength	# Convert longation to percentange
-		
-		# Redraw Guage
-		x,y,x1,y1 = hf.scaleCoordinates(self.g_x0, self.g_y0, self.g_x1, self.g_y1, widthFact, eFact)
-		self.canvas.coords(self.guage, x, y, x1, y1)
-		leftPos = x
-		rightPos = x1
-
-		# Redraw left neck
-		dx = neckWidthFact*(self.guageWidth)
-		dy = neckHeightFact*(self.guageWidth)
-		x,y,x1,y1 = hf.translateCoordinates(self.ln_x0, self.ln_y0, self.ln_x1 ,self.ln_y1, leftPos-self.ln_x0, 0)
-		x,y,x1,y1 = hf.stretchCoordinates(x-1,y,x1-1,y1,dx,dy)
-		self.canvas.coords(self.leftNeck, x, y, x1, y1)
-
-		# Redraw right neck
-		x,y,x1,y1 = hf.translateCoordinates(self.rn_x0, self.rn_y0, self.rn_x1 ,self.rn_y1,-(self.rn_x1-rightPos), 0)
-		x,y,x1,y1 = hf.stretchCoordinates(x,y,x1,y1,dx,dy)
-		self.canvas.coords(self.rightNeck, x, y, x1, y1)
-
-		# Redraw top left fillet
-		x,y,x1,y1 = hf.translateCoordinates(self.tlf_x0, self.tlf_y0, self.tlf_x1, self.tlf_y1, 0, -e)
-		self.canvas.coords(self.topLeftFillet,x,y,leftPos-1,y1)
-
-		# Redraw top right fillet
-		x,y,x1,y1 = hf.translateCoordinates(self.trf_x0, self.trf_y0, self.trf_x1, self.trf_y1, 0, -e)
-		self.canvas.coords(self.topRightFillet,rightPos,y,x1,y1)
-
-		# Redraw bottom left fillet
-		x,y,x1,y1 = hf.translateCoordinates(self.blf_x0, self.blf_y0, self.blf_x1, self.blf_y1, 0, e)
-		self.canvas.coords(self.bottomLeftFillet,x,y,leftPos-1,y1)
-
-		# Redraw bottom right fillet
-		x,y,x1,y1 = hf.translateCoordinates(self.brf_x0, self.brf_y0, self.brf_x1, self.brf_y1, 0, e)
-		self.canvas.coords(self.bottomRightFillet,rightPos,y,x1,y1)
-
-		# Redraw top blank area
-		x,y,x1,y1 = hf.translateCoordinates(self.tb_x0, self.tb_y0, self.tb_x1, self.tb_y1, 0, -e)
-		self.canvas.coords(self.topBlank,x,y,x1,y1)
-
-		# Redraw bottom blank area
-		x,y,x1,y1 = hf.translateCoordinates(self.bb_x0, self.bb_y0, self.bb_x1, self.bb_y1, 0, e)
-		self.canvas.coords(self.bottomBlank,x,y,x1,y1)
-
-		# Redraw top gripper
-		x,y,x1,y1 = hf.translateCoordinates(self.tg_x0, self.tg_y0, self.tg_x1, self.tg_y1, 0, -e)
-		self.canvas.coords(self.topGrip, x, y, x1, y1)
-
-		# Redraw bottom gripper
-		x,y,x1,y1 = hf.translateCoordinates(self.bg_x0, self.bg_y0, self.bg_x1 ,self.bg_y1, 0, e)
-		self.canvas.coords(self.bottomGrip, x, y, x1, y1)
+
+		# Blanks, fillets and grippers move up or down with the elongation
+		boxes = ah.translateBoxes(self.baseBoxes, 0, np.multiply.outer(e, self.stretchDir))
+
+		# Guage is scaled about its center
+		boxes[..., 0, :] = ah.scaleBoxes(self.baseBoxes[0], widthFact, eFact)
+		leftPos = boxes[..., 0, 0]
+		rightPos = boxes[..., 0, 2]
+
+		# Necks are moved to the sides of the guage and stretched into ellipses
+		dx = np.multiply(neckWidthFact, self.guageWidth)[..., None]
+		dy = np.multiply(neckHeightFact, self.guageWidth)[..., None]
+		shift = np.stack([leftPos-1-self.ln_x0, rightPos-self.rn_x1], axis=-1)
+		boxes[..., 1:3, :] = ah.stretchBoxes(ah.translateBoxes(self.baseBoxes[1:3], shift, 0), dx, dy)
+
+		# Fillets follow the sides of the guage
+		boxes[..., [4, 7], 2] = leftPos[..., None]-1
+		boxes[..., [5, 8], 0] = rightPos[..., None]
+		return boxes
+
+	def setKeyframes(self, elongation, widthFact, neckWidthFact, neckHeightFact):
+		"""
+		Compute the boxes of every frame of a tensile curve at once, given one value per frame,
+		so that showFrame only looks them up
+		"""
+		self.keyframes = self.rodBoxes(elongation, widthFact, neckWidthFact, neckHeightFact).tolist()
+
+	def showFrame(self, frame):
+		"""
+		Move the shapes to a frame given to setKeyframes. Must be called after drawRod
+		"""
+		self.showBoxes(self.keyframes[frame])
+
+	def updateRod(self, elongation, widthFact, neckWidthFact, neckHeightFact):
+		"""
+		Update the rod position based on initial drawing. Must be called after drawRod.
+		Used for values that are not part of the keyframes
+		"""
+		self.showBoxes(self.rodBoxes(elongation, widthFact, neckWidthFact, neckHeightFact).tolist())
+
+	def showBoxes(self, boxes):
+		"""
+		Send the boxes (a list of 11 [x0, y0, x1, y1] lists) to the canvas. Only the shapes that
+		changed are sent
+		"""
+		shown = self.shown
+		for i, box in enumerate(boxes):
+			if box != shown[i]:
+				self.canvas.coords(self.items[i], *box)
+				shown[i] = box
 
 	def drawFracture(self, curvature):
 		"""
@@ -821,4 +912,5 @@ class Rod():
 		Reset the rod to the original
 		"""
 		self.canvas.delete("all")
+		self.shown[:] = [None]*len(self.shown)
 		self.drawRod()
\ No newline at end of file
@@ -0,0 +1,115 @@
+'''
+Description: This file contains the shared image store. Every file in the image folder is decoded
+			once and the tkinter images made from it are shared by all the pages, so opening a
+			page a second time or creating another view does not read the disk again.
+'''
+import os
+import threading
+import tkinter as tk
+import Misc.Styling as st
+
+"""
+Cache of decoded images. Pixel data is decoded with PIL, which is safe to do in a background
+thread; the tkinter images are always created on the main thread the first time they are asked for.
+Without PIL loaded, PNG files are read by tkinter directly so the home page does not need PIL
+"""
+class AssetManager():
+	def __init__(self, path=st.IMG_PATH):
+		self.path = path
+		self.lock = threading.Lock()
+		self.images = {}	# File name -> decoded PIL image
+		self.photos = {}	# (file name, variant) -> tkinter image
+		self.photoBytes = {}	# (file name, variant) -> bytes held by Tk, kept after the window closes
+
+	def names(self):
+		"""
+		Return the image files in the image folder
+		"""
+		return sorted(n for n in os.listdir(self.path) if n.lower().endswith('.png'))
+
+	def image(self, name):
+		"""
+		Return the decoded PIL image of a file. Treat it as read only, it is shared
+		"""
+		with self.lock:
+			img = self.images.get(name)
+		if img is None:
+			from PIL import Image
+			img = Image.open(self.path+name)
+			img.load()
+			with self.lock:
+				img = self.images.setdefault(name, img)
+		return img
+
+	def photo(self, name, variant=None, make=None):
+		"""
+		Return the tkinter image of a file. A variant (e.g. a rotated sprite) is made once by
+		calling make with the decoded PIL image and is cached under (name, variant)
+		"""
+		key = (name, variant)
+		photo = self.photos.get(key)
+		if photo is None:
+			if make is not None:
+				from PIL import ImageTk
+				photo = ImageTk.PhotoImage(make(self.image(name)))
+			elif name in self.images:
+				from PIL import ImageTk
+				photo = ImageTk.PhotoImage(self.images[name])
+			else:
+				photo = tk.PhotoImage(file=self.path+name)
+			self.photos[key] = photo
+			self.photoBytes[key] = photo.width()*photo.height()*4
+		return photo
+
+	def decode(self, names=None):
+		"""
+		Decode files ahead of time. Safe to call from any thread
+		"""
+		for name in self.names() if names is None else names:
+			self.image(name)
+
+	def preload(self, names=None):
+		"""
+		Decode files in a daemon thread so that pages built later only create the tkinter images
+		"""
+		thread = threading.Thread(target=self.decode, args=(names,), name='assets', daemon=True)
+		thread.start()
+		return thread
+
+	def clear(self):
+		"""
+		Drop every cached image. Images still shown on a canvas must be kept alive by the caller
+		"""
+		with self.lock:
+			self.images.clear()
+		self.photos.clear()
+		self.photoBytes.clear()
+
+	def memoryUsage(self):
+		"""
+		Return a dict of file name -> (decoded bytes, tkinter image bytes). Tk keeps 4 bytes per pixel
+		"""
+		usage = {}
+		with self.lock:
+			for name, img in self.images.items():
+				usage[name] = [img.width*img.height*len(img.getbands()), 0]
+		for (name, variant), size in self.photoBytes.items():
+			usage.setdefault(name, [0, 0])[1] += size
+		return {name: tuple(sizes) for name, sizes in usage.items()}
+
+	def report(self):
+		"""
+		Return a table of the memory used by each cached asset
+		"""
+		usage = self.memoryUsage()
+		lines = ["%-28s %10s %10s" % ("asset", "decoded kB", "tk kB")]
+		for name in sorted(usage):
+			decoded, photos = usage[name]
+			lines.append("%-28s %10.1f %10.1f" % (name, decoded/1024, photos/1024))
+		decoded = sum(u[0] for u in usage.values())
+		photos = sum(u[1] for u in usage.values())
+		lines.append("%-28s %10.1f %10.1f" % ("total", decoded/1024, photos/1024))
+		return "\n".join(lines)
+
+# Shared by every page
+assets = AssetManager()
@@ -0,0 +1,316 @@
+'''
+Description: This file contains the benchmark suite. It measures the import time of each module,
+			the time to build each page, the cost of one model call and the cost of one animation
+			frame. Results are written as JSON and can be compared to an earlier run to catch
+			changes that slow the tool down.
+'''
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from Misc.Startup import parseImportTimes
+
+# Modules timed on their own in a fresh interpreter
+BENCH_MODULES = [
+	'MainView',
+	'MainController',
+	'MechanicalWorkshop.MWModel',
+	'MechanicalWorkshop.MWView',
+	'MechanicalWorkshop.MWController',
+	'Thermocouple.TCModel',
+	'Thermocouple.TCView',
+	'Thermocouple.TCController',
+	'Copyright.CRController',
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+"""
+Stand-in for tk.Canvas when there is no display. Every call is counted and the items are kept so
+the animation code runs exactly as it would on a real canvas, minus the drawing
+"""
+class RecordingCanvas():
+	def __init__(self):
+		self.items = {}
+		self.calls = {}
+		self.nextItem = 1
+
+	def record(self, name):
+		self.calls[name] = self.calls.get(name, 0)+1
+
+	def create(self, kind, *coords, **options):
+		self.record('create_'+kind)
+		item = self.nextItem
+		self.nextItem += 1
+		self.items[item] = [kind, list(coords), options]
+		return item
+
+	def __getattr__(self, name):
+		if name.startswith('create_'):
+			return lambda *coords, **options: self.create(name[7:], *coords, **options)
+		raise AttributeError(name)
+
+	def coords(self, item, *coords):
+		if not coords:
+			return self.items[item][1]
+		self.record('coords')
+		self.items[item][1] = list(coords)
+
+	def itemconfig(self, item, **options):
+		self.record('itemconfig')
+		self.items[item][2].update(options)
+
+	def delete(self, item):
+		self.record('delete')
+		if item == 'all':
+			self.items.clear()
+		else:
+			self.items.pop(item, None)
+
+	def find_withtag(self, tag):
+		return tuple(self.items) if tag == 'all' else ((tag,) if tag in self.items else ())
+
+	def update_idletasks(self):
+		pass
+
+"""
+Stand-in for the shared asset cache when there is no display. Images are still decoded but no
+tkinter images are created
+"""
+class StubAssets():
+	def __init__(self, assets):
+		self.assets = assets
+
+	def image(self, name):
+		return self.assets.image(name)
+
+	def photo(self, name, variant=None, make=None):
+		return (name, variant)
+
+def timeCalls(func, args, repeat=5):
+	"""
+	Call func once for each item of args, repeat times. Return the median time per call in ms
+	"""
+	runs = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for a in args:
+			func(*a)
+		runs.append((time.perf_counter()-start)/len(args))
+	return statistics.median(runs)*1000
+
+def timeFrames(setup, frame, args, flush, repeat=5):
+	"""
+	Run an animation repeat times: call setup, then frame once for each item of args followed by
+	flush. Return the median time per frame in ms, setup not included
+	"""
+	runs = []
+	for _ in range(repeat):
+		setup()
+		flush()
+		start = time.perf_counter()
+		for a in args:
+			frame(*a)
+			flush()
+		runs.append((time.perf_counter()-start)/len(args))
+	return statistics.median(runs)*1000
+
+def importTimes(modules=BENCH_MODULES, repeat=3):
+	"""
+	Import each module in a fresh interpreter and return the best cumulative import time in ms
+	"""
+	times = {}
+	for module in modules:
+		best = None
+		for _ in range(repeat):
+			child = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import '+module],
+				capture_output=True, text=True, cwd=ROOT)
+			if child.returncode != 0:
+				break
+			rows = {name: cumulative for name, selfTime, cumulative in parseImportTimes(child.stderr)}
+			if module in rows:
+				best = rows[module] if best is None else min(best, rows[module])
+		if best is not None:
+			times['import.'+module] = best/1000
+	return times
+
+def tensileFrames(CW=40):
+	"""
+	Run the tensile test once and return the model, the rod values and the curve length of each frame
+	"""
+	from MechanicalWorkshop.MWModel import TensileTestModel
+	model = TensileTestModel()
+	YS, UTS = model.setParameters(CW)
+	model.init_simVariables(YS, UTS)
+	rod = []
+	lengths = []
+	done = False
+	while not done:
+		xvals, yvals, elongation, width, neckWidth, neckHeight, done = model.updateModel()
+		rod.append((elongation, width, neckWidth, neckHeight))
+		lengths.append(len(xvals))
+	return model, rod, lengths
+
+def modelBenchmarks(repeat=5):
+	"""
+	Time one call of TensileTestModel.updateModel, ThermocoupleModel.calculateVoltage and
+	ThermocoupleModel.getVoltage, and of a 1000 point ThermocoupleModel.getCurve
+	"""
+	import numpy as np
+	from Thermocouple.TCModel import ThermocoupleModel
+	model, rod, lengths = tensileFrames()
+	def run():
+		model.resetData()
+		for _ in rod:
+			model.updateModel()
+	metrics = {'model.updateModel': timeCalls(run, [()], repeat)/len(rod)}
+
+	tc = ThermocoupleModel()
+	args = [(6.5, -41.0, T) for T in range(25, 1201)]
+	metrics['model.calculateVoltage'] = timeCalls(tc.calculateVoltage, args, repeat)
+	args = [(2, 1, T) for T in range(25, 1201)]
+	metrics['model.getVoltage'] = timeCalls(tc.getVoltage, args, repeat)
+	temperatures = np.linspace(25, 1200, 1000)
+	metrics['model.getCurve'] = timeCalls(tc.getCurve, [(2, 1, temperatures)], repeat*20)
+	return metrics
+
+def frameBenchmarks(root=None, repeat=5):
+	"""
+	Time one frame of the cold roller, rod and stress-strain graph animations. With root the real
+	pages are built on it, otherwise the canvases are recorded and the graph is drawn with Agg
+	"""
+	import numpy as np
+	import MechanicalWorkshop.MWView as MWView
+	metrics = {}
+	model, rodFrames, lengths = tensileFrames()
+	x = np.array(model.Xvals)
+	y = np.array(model.Yvals)
+	graphFrames = [(x[:n], y[:n]) for n in lengths]
+	xBounds, yBounds = float(x.max()), float(y.max())
+
+	if root is not None:
+		start = time.perf_counter()
+		coldRollerView = MWView.ColdRollerView(root)
+		root.update_idletasks()
+		metrics['page.ColdRollerView'] = (time.perf_counter()-start)*1000
+		start = time.perf_counter()
+		tensileView = MWView.TensileTestView(root)
+		root.update_idletasks()
+		metrics['page.TensileTestView'] = (time.perf_counter()-start)*1000
+		from Thermocouple.TCView import ThermocoupleView
+		start = time.perf_counter()
+		ThermocoupleView(root)
+		root.update_idletasks()
+		metrics['page.ThermocoupleView'] = (time.perf_counter()-start)*1000
+		roller = coldRollerView.coldRoller
+		rod = tensileView.rod
+		flush = root.update_idletasks
+	else:
+		realAssets = MWView.assets
+		MWView.assets = StubAssets(realAssets)
+		try:
+			roller = MWView.ColdRollerGraphic(RecordingCanvas(), 600, 315, 'white')
+		finally:
+			MWView.assets = realAssets
+		roller.drawRoller()
+		rod = MWView.Rod(RecordingCanvas(), 250, 595, 'black')
+		rod.drawRod()
+		tensileView = aggTensileView()
+		flush = lambda: None
+
+	# Cold roller, two turns of the rollers per run
+	roller.updateRollers(12, 30, 40)
+	frames = [()]*roller.totalSteps
+	metrics['frame.updateAni'] = timeFrames(lambda: None, roller.updateAni, frames, flush, repeat)
+
+	# Rod and graph, every frame of one tensile test per run
+	curve = model.curve
+	rod.setKeyframes(curve.strain, curve.width, curve.neckWidth, curve.neckHeight)
+	metrics['frame.updateRod'] = timeFrames(rod.resetRod, rod.showFrame, [(i,) for i in range(len(rodFrames))], flush, repeat)
+	metrics['frame.updateGraph'] = timeFrames(lambda: tensileView.setGraphSize(xBounds, yBounds),
+		tensileView.updateGraph, graphFrames, flush, repeat)
+	return metrics
+
+def aggTensileView():
+	"""
+	Build the parts of a TensileTestView that updateGraph uses, drawn with Agg instead of tkinter
+	"""
+	from MechanicalWorkshop.MWView import TensileTestView
+	from matplotlib.figure import Figure
+	from matplotlib.backends.backend_agg import FigureCanvasAgg
+	view = TensileTestView.__new__(TensileTestView)
+	view.f = Figure(figsize=(6,6), dpi=100)
+	view.a = view.f.add_subplot(111)
+	view.a.grid(color='grey', linestyle='-', linewidth=0.3)
+	view.line = view.a.plot([],[],"-")
+	view.segment = view.a.plot([],[],"-", color=view.line[0].get_color(), animated=True)[0]
+	view.drawn = 0
+	view.lineSize = 0
+	view.xvals = view.yvals = None
+	view.graphWindow = FigureCanvasAgg(view.f)
+	view.graphWindow.mpl_connect('draw_event', view.drawLine)
+	return view
+
+def runBenchmarks(stub=False, imports=True, repeat=5):
+	"""
+	Run the whole suite and return the results as a dict. Uses the display unless stub is set or
+	there is none, in which case the page construction times are left out
+	"""
+	import tkinter as tk
+	root = None
+	if not stub:
+		try:
+			root = tk.Tk()
+			root.withdraw()
+		except tk.TclError:
+			root = None
+
+	metrics = {}
+	if imports:
+		metrics.update(importTimes())
+	metrics.update(modelBenchmarks(repeat))
+	try:
+		metrics.update(frameBenchmarks(root, repeat))
+	finally:
+		if root is not None:
+			root.destroy()
+
+	return {
+		'mode': 'stub' if root is None else 'display',
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'metrics': metrics,
+	}
+
+def compareResults(current, baseline, threshold=0.25, noise=0.005):
+	"""
+	Return (metric, baseline ms, current ms) for every metric more than threshold slower than
+	the baseline and more than noise ms slower, so sub-microsecond metrics do not fail on timer
+	noise. Only metrics present in both runs are compared, and both must use the same mode
+	"""
+	if current.get('mode') != baseline.get('mode'):
+		raise ValueError("the baseline was run in %s mode, this run in %s mode" % (baseline.get('mode'), current.get('mode')))
+	regressions = []
+	for name, old in sorted(baseline['metrics'].items()):
+		new = current['metrics'].get(name)
+		if new is not None and old > 0 and new > old*(1+threshold) and new-old > noise:
+			regressions.append((name, old, new))
+	return regressions
+
+def saveResults(results, path):
+	"""
+	Write benchmark results to a JSON file
+	"""
+	with open(path, 'w') as f:
+		json.dump(results, f, indent=2, sort_keys=True)
+
+def loadResults(path):
+	"""
+	Read benchmark results written by saveResults
+	"""
+	with open(path) as f:
+		return json.load(f)
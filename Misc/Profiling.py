@@ -0,0 +1,128 @@
+'''
+Description: This file contains lightweight instrumentation for the animation loops. Per-frame
+			phase durations are kept in a fixed size ring buffer and summarised in an overlay
+'''
+import time
+import numpy as np
+from Misc.arrayHelpers import RingBuffer
+
+PHASES = ('model', 'canvas', 'plot', 'idle') # Idle is the time tkinter spent between two frames
+
+"""
+Records how long each phase of every animation frame takes. A frame is started with beginFrame,
+each phase is closed with mark and the frame is finished with endFrame
+"""
+class FrameTimer():
+	def __init__(self, capacity=1024, clock=time.perf_counter):
+		self.clock = clock
+		self.columns = ('start',)+PHASES+('dropped',)
+		self.frames = RingBuffer(capacity, len(self.columns))
+		self.row = np.zeros(len(self.columns))
+		self.lastMark = None
+		self.lastEnd = None # End of the previous frame, None at the start of an animation
+
+	def restart(self):
+		"""
+		Called when an animation (re)starts so the pause is not counted as idle time
+		"""
+		self.lastEnd = None
+
+	def beginFrame(self):
+		"""
+		Start timing a frame
+		"""
+		now = self.clock()
+		self.row[:] = 0
+		self.row[0] = now
+		self.row[1+PHASES.index('idle')] = 0 if self.lastEnd is None else now-self.lastEnd
+		self.lastMark = now
+
+	def mark(self, phase):
+		"""
+		Add the time since the last mark to phase
+		"""
+		now = self.clock()
+		self.row[1+PHASES.index(phase)] += now-self.lastMark
+		self.lastMark = now
+
+	def endFrame(self, dropped=0):
+		"""
+		Finish the frame. dropped is the number of frames skipped to catch up
+		"""
+		self.row[-1] = dropped
+		self.frames.append(self.row)
+		self.lastEnd = self.clock()
+
+	def stats(self):
+		"""
+		Return fps, median and 99th percentile frame time (ms) and the number of dropped frames
+		over the frames in the buffer. Frame time is the time from the start of one frame to the next
+		within the same run of an animation
+		"""
+		frames = self.frames.values()
+		dropped = int(frames[:, -1].sum())
+		# Skip the gap before the first frame of each run, its idle time is 0
+		periods = np.diff(frames[:, 0])[frames[1:, 1+PHASES.index('idle')] > 0]*1000
+		if len(periods) == 0:
+			return 0.0, 0.0, 0.0, dropped
+		fps = 1000/periods.mean()
+		p50, p99 = np.percentile(periods, (50, 99))
+		return fps, p50, p99, dropped
+
+	def exportCSV(self, path):
+		"""
+		Write the frames in the buffer to a CSV file, durations in ms
+		"""
+		frames = self.frames.values()
+		frames[:, 1:-1] *= 1000
+		np.savetxt(path, frames, delimiter=',', header=','.join(self.columns), comments='', fmt='%.6f')
+
+"""
+Text overlay showing the frame statistics on a canvas. Hidden until toggled
+"""
+class PerformanceOverlay():
+	def __init__(self, canvas, timer, every=10):
+		self.canvas = canvas
+		self.timer = timer
+		self.every = every	# Refresh the text every this many frames
+		self.frames = 0
+		self.visible = False
+		self.text = None
+		self.createText()
+
+	def createText(self):
+		"""
+		Create the text item. Called again if the canvas was cleared
+		"""
+		self.text = self.canvas.create_text(5, 5, anchor='nw', text='', fill='yellow',
+			state='normal' if self.visible else 'hidden')
+
+	def toggle(self, event=None):
+		"""
+		Show or hide the overlay
+		"""
+		self.visible = not self.visible
+		if not self.canvas.find_withtag(self.text):
+			self.createText()
+		self.canvas.itemconfig(self.text, state='normal' if self.visible else 'hidden')
+		self.refresh()
+
+	def update(self):
+		"""
+		Called once per frame, refreshes the text every few frames while visible
+		"""
+		self.frames += 1
+		if self.visible and self.frames % self.every == 0:
+			self.refresh()
+
+	def refresh(self):
+		"""
+		Redraw the statistics text
+		"""
+		if self.visible:
+			if not self.canvas.find_withtag(self.text):
+				self.createText()
+			fps, p50, p99, dropped = self.timer.stats()
+			self.canvas.itemconfig(self.text,
+				text="FPS %.1f  p50 %.1f ms  p99 %.1f ms  dropped %d" % (fps, p50, p99, dropped))
+			self.canvas.tag_raise(self.text)
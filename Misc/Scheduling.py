@@ -0,0 +1,89 @@
+'''
+Description: This file contains helpers for scheduling animation frames on the tkinter main loop
+'''
+import math
+import time
+
+"""
+Clock that converts real elapsed time into animation steps. Each frame asks the clock how many
+model steps are due; if the previous frame ran late several steps are due at once and the frames
+in between are dropped instead of slowing the animation down
+"""
+class AnimationClock():
+	def __init__(self, stepInterval, clock=time.perf_counter):
+		self.defaultInterval = stepInterval # Real time per model step in seconds
+		self.stepInterval = stepInterval
+		self.clock = clock
+		self.last = None	# Time of the last tick
+		self.debt = 0		# Elapsed time not yet turned into steps
+		self.dropped = 0	# Number of frames skipped to catch up
+
+	def start(self, totalSteps=None, duration=None):
+		"""
+		Start the clock. If duration (seconds) is given the steps are spread so that totalSteps
+		take that long, otherwise each step takes the default interval. The first tick yields a step
+		"""
+		if duration is not None and totalSteps:
+			self.stepInterval = duration/totalSteps
+		else:
+			self.stepInterval = self.defaultInterval
+		self.last = self.clock()
+		self.debt = self.stepInterval
+		self.dropped = 0
+
+	def resume(self):
+		"""
+		Continue after a pause without counting the paused time
+		"""
+		self.last = self.clock()
+
+	def tick(self):
+		"""
+		Return the number of model steps due since the last tick
+		"""
+		now = self.clock()
+		self.debt += now-self.last
+		self.last = now
+		steps = int(self.debt/self.stepInterval)
+		self.debt -= steps*self.stepInterval
+		if steps > 1:
+			self.dropped += steps-1
+		return steps
+
+	def nextDelay(self):
+		"""
+		Milliseconds until the next step is due. Used to schedule the next frame with after()
+		"""
+		return max(1, math.ceil((self.stepInterval-self.debt)*1000))
+
+"""
+Collapse bursts of events into a single call. Calling the coalescer only remembers the latest
+arguments; the wrapped function runs once from after_idle, after tkinter has handled the pending
+events and before it redraws
+"""
+class Coalescer():
+	def __init__(self, widget, func):
+		self.widget = widget
+		self.func = func
+		self.args = ()
+		self.pending = None # Id of the scheduled call
+
+	def __call__(self, *args):
+		self.args = args
+		if self.pending is None:
+			self.pending = self.widget.after_idle(self.run)
+
+	def run(self):
+		"""
+		Call the function with the latest arguments
+		"""
+		self.pending = None
+		self.func(*self.args)
+
+	def flush(self):
+		"""
+		Run a scheduled call right away
+		"""
+		if self.pending is not None:
+			self.widget.after_cancel(self.pending)
+			self.run()
@@ -0,0 +1,80 @@
+'''
+Description: This file contains helpers for starting the simulation tool quickly. The heavy modules
+			are imported in a background thread while the home page is shown, and the startup
+			profile reports how long each module takes to import.
+'''
+import importlib
+import subprocess
+import sys
+import threading
+
+# Modules the pages need but the home page does not, in the order they are preloaded
+PRELOAD_MODULES = [
+	'numpy',
+	'PIL.Image',
+	'PIL.ImageTk',
+	'matplotlib.figure',
+	'matplotlib.backends.backend_tkagg',
+	'MechanicalWorkshop.MWController',
+	'Thermocouple.TCController',
+	'Copyright.CRController',
+]
+
+def preload(modules=PRELOAD_MODULES, images=True):
+	"""
+	Import modules in a daemon thread, then decode the page images. A page built before its modules
+	are loaded simply imports them itself, Python's import lock makes sure nothing is imported twice
+	"""
+	def run():
+		for name in modules:
+			try:
+				importlib.import_module(name)
+			except ImportError:
+				pass # The page will report the error when it is built
+		if images:
+			from Misc.Assets import assets
+			try:
+				assets.decode()
+			except (ImportError, OSError):
+				pass # Missing images are reported when the page asks for them
+	thread = threading.Thread(target=run, name='preload', daemon=True)
+	thread.start()
+	return thread
+
+def parseImportTimes(text):
+	"""
+	Parse the output of python -X importtime into a list of (module, self us, cumulative us)
+	"""
+	rows = []
+	for line in text.splitlines():
+		if not line.startswith('import time:') or 'self [us]' in line:
+			continue
+		selfTime, cumulative, name = line[len('import time:'):].split('|')
+		rows.append((name.strip(), int(selfTime), int(cumulative)))
+	return rows
+
+def startupProfile(script, top=25):
+	"""
+	Start the simulation tool in a child interpreter with -X importtime, close it as soon as the
+	home page is drawn and print the import time of each module and each top level package
+	"""
+	child = subprocess.run([sys.executable, '-X', 'importtime', script, '--startup-profile-child'],
+		capture_output=True, text=True)
+	if child.returncode != 0:
+		sys.stderr.writelines(l for l in child.stderr.splitlines(True) if not l.startswith('import time:'))
+		raise SystemExit("Error: the simulation tool did not start")
+	rows = parseImportTimes(child.stderr)
+
+	packages = {}
+	for name, selfTime, cumulative in rows:
+		top_level = name.split('.')[0]
+		packages[top_level] = packages.get(top_level, 0)+selfTime
+
+	print(child.stdout.strip())
+	print("Total import time: %.1f ms in %d modules" % (sum(r[1] for r in rows)/1000, len(rows)))
+	print("\nSlowest packages (self time):")
+	for name, total in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+		print("  %8.1f ms  %s" % (total/1000, name))
+	print("\nSlowest modules (self ms, cumulative ms):")
+	for name, selfTime, cumulative in sorted(rows, key=lambda r: -r[1])[:top]:
+		print("  %8.1f %8.1f  %s" % (selfTime/1000, cumulative/1000, name))
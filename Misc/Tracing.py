@@ -0,0 +1,72 @@
+'''
+Description: This file contains opt-in tracing of the controller callbacks. When the MLS_TRACE
+			environment variable is set to a path, every method of a class decorated with traced
+			emits begin/end events that are written to that path as Chrome Trace Event JSON on exit.
+			The file can be opened in chrome://tracing or Perfetto.
+'''
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+"""
+Collects trace events. Only the newest maxEvents are kept so long sessions stay bounded
+"""
+class Tracer():
+	def __init__(self, maxEvents=1000000):
+		self.events = deque(maxlen=maxEvents)
+		self.pid = os.getpid()
+
+	def begin(self, name):
+		"""
+		Record the start of name on the current thread
+		"""
+		self.events.append(('B', name, time.perf_counter(), threading.get_ident()))
+
+	def end(self, name):
+		"""
+		Record the end of name on the current thread
+		"""
+		self.events.append(('E', name, time.perf_counter(), threading.get_ident()))
+
+	def write(self, path):
+		"""
+		Write the events as Chrome Trace Event JSON, timestamps in microseconds
+		"""
+		events = [{'name': name, 'cat': name.split('.')[0], 'ph': ph, 'ts': ts*1e6, 'pid': self.pid, 'tid': tid}
+			for ph, name, ts, tid in self.events]
+		with open(path, 'w') as f:
+			json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+tracer = None
+if os.environ.get('MLS_TRACE'):
+	tracer = Tracer()
+	atexit.register(tracer.write, os.environ['MLS_TRACE'])
+
+def traceCall(name, func):
+	"""
+	Wrap func so every call is recorded as name
+	"""
+	@functools.wraps(func)
+	def wrapper(*args, **kwargs):
+		tracer.begin(name)
+		try:
+			return func(*args, **kwargs)
+		finally:
+			tracer.end(name)
+	return wrapper
+
+def traced(cls):
+	"""
+	Class decorator that traces __init__ and every public method defined in the class.
+	Does nothing unless tracing is enabled, so there is no cost in normal runs
+	"""
+	if tracer is None:
+		return cls
+	for attr, value in list(vars(cls).items()):
+		if callable(value) and (attr == '__init__' or not attr.startswith('_')):
+			setattr(cls, attr, traceCall(cls.__name__+'.'+attr, value))
+	return cls
@@ -0,0 +1,99 @@
+'''
+Description: This file contains NumPy versions of the helper functions. They are kept apart from
+			helperFunctions so that modules needing only the plain helpers do not import NumPy
+'''
+import numpy as np
+
+def _boxFactor(f):
+	"""
+	Turn a scalar or per-box factor into something that broadcasts against boxes of shape (..., 4)
+	"""
+	f = np.asarray(f, dtype=np.float64)
+	return f[..., None] if f.ndim else f
+
+def _joinBoxes(x, y):
+	"""
+	Interleave (..., 2) arrays of x and y coordinates back into (..., 4) boxes
+	"""
+	result = np.empty(np.broadcast_shapes(x.shape, y.shape)[:-1]+(4,))
+	result[..., 0::2] = x
+	result[..., 1::2] = y
+	return result
+
+def scaleBoxes(boxes, scaleX, scaleY):
+	"""
+	Array version of helperFunctions.scaleCoordinates. boxes has shape (N, 4) with rows x0, y0, x1, y1,
+	the factors are scalars or per-box arrays of shape (N,) (or (K, N) for K keyframes)
+	"""
+	boxes = np.asarray(boxes, dtype=np.float64)
+	x = boxes[..., 0::2]
+	y = boxes[..., 1::2]
+	xCenter = x.mean(axis=-1, keepdims=True)
+	yCenter = y.mean(axis=-1, keepdims=True)
+	newX = xCenter+(x-xCenter)*_boxFactor(scaleX) # Keeps the order of x0 and x1
+	newY = yCenter+(y-yCenter)*_boxFactor(scaleY)
+	return _joinBoxes(newX, newY)
+
+def stretchBoxes(boxes, pixX, pixY):
+	"""
+	Array version of helperFunctions.stretchCoordinates. Factors are given as in scaleBoxes
+	"""
+	boxes = np.asarray(boxes, dtype=np.float64)
+	x = boxes[..., 0::2]
+	y = boxes[..., 1::2]
+	outward = np.array([-1, 1])
+	newX = x+outward*np.where(x[..., 1:] >= x[..., :1], 1, -1)*_boxFactor(pixX)
+	newY = y+outward*np.where(y[..., 1:] >= y[..., :1], 1, -1)*_boxFactor(pixY)
+	return _joinBoxes(newX, newY)
+
+def translateBoxes(boxes, pixX, pixY):
+	"""
+	Array version of helperFunctions.translateCoordinates. Factors are given as in scaleBoxes
+	"""
+	boxes = np.asarray(boxes, dtype=np.float64)
+	newX = boxes[..., 0::2]+_boxFactor(pixX)
+	newY = boxes[..., 1::2]+_boxFactor(pixY)
+	return _joinBoxes(newX, newY)
+
+"""
+Fixed size ring buffer of rows. Once full, new rows overwrite the oldest ones so memory stays bounded
+"""
+class RingBuffer():
+	def __init__(self, capacity, width=1, dtype=np.float64):
+		self.data = np.zeros((capacity, width), dtype=dtype)
+		self.count = 0 # Number of rows ever appended
+
+	def __len__(self):
+		return min(self.count, len(self.data))
+
+	def append(self, row):
+		"""
+		Add one row
+		"""
+		self.data[self.count % len(self.data)] = row
+		self.count += 1
+
+	def extend(self, rows):
+		"""
+		Add several rows at once
+		"""
+		rows = np.asarray(rows, dtype=self.data.dtype).reshape(-1, self.data.shape[1])
+		self.count += len(rows)
+		rows = rows[-len(self.data):] # Older rows would be overwritten anyway
+		index = (self.count-len(rows)+np.arange(len(rows))) % len(self.data)
+		self.data[index] = rows
+
+	def values(self):
+		"""
+		Stored rows from oldest to newest
+		"""
+		if self.count <= len(self.data):
+			return self.data[:self.count].copy()
+		start = self.count % len(self.data)
+		return np.concatenate([self.data[start:], self.data[:start]])
+
+	def clear(self):
+		"""
+		Remove every row
+		"""
+		self.count = 0
@@ -2,13 +2,17 @@
 Description: This file contains the classes for implementing the thermocouple page controller!
 Author: Andrew Lucentini :-)
 '''
+import atexit
 from Thermocouple.TCView import ThermocoupleView
 from Thermocouple.TCModel import ThermocoupleModel
+from Thermocouple.TCLogger import DataLogger
+from Misc.Tracing import traced
 
 """
 Thermocouple simulation controller. Utilized in conjuction with the 
 thermocouple view and model
 """
+@traced
 class ThermocoupleController():
 	def __init__(self, parent, mainController):
 		self.mainController = mainController
@@ -27,14 +31,25 @@ class ThermocoupleController():
 			self.page1.element_one.boxes[i].select_set(0)
 			self.page1.element_two.boxes[i].select_set(0)
 
-		# Set metal 1 and metal 2, calculate initial voltage
-		self.metal_1 = self.page1.element_one[0]
-		self.metal_2 = self.page1.element_two[0]
+		# Set metal 1 and metal 2 as rows of the material table, calculate initial voltage
+		self.metal_1 = 0
+		self.metal_2 = 0
 		self.calculateVoltage(0)
 
+		# Data logger, sampled in the background and drawn every refreshRate ms
+		self.logger = DataLogger()
+		self.refreshRate = 33
+		self.loggerJob = None # Id of the scheduled logger frame
+		atexit.register(self.logger.stop, wait=True) # The writer thread is a daemon, finish the file when the window is closed
+
 		# Bind button, slider, and list boxes
 		self.page1.homeButton.bind("<ButtonRelease-1>",self.exitPage)
 		self.page1.T1.configure(command=self.calculateVoltage)
+		self.page1.loggerButton.bind("<ButtonRelease-1>", self.toggleLogger)
+		self.page1.recordButton.bind("<ButtonRelease-1>", self.toggleRecording)
+		self.page1.rate.configure(command=self.setLoggerRate)
+		self.page1.rate.bind("<Return>", self.setLoggerRate)
+		self.page1.rate.bind("<FocusOut>", self.setLoggerRate)
 		for i in range(2):
 			self.page1.element_one.boxes[i].bind('<KeyRelease-Down>', self.getElementOne)
 			self.page1.element_one.boxes[i].bind('<KeyRelease-Up>', self.getElementOne)
@@ -50,19 +65,19 @@ class ThermocoupleController():
 		"""
 		temperature = self.page1.T1.get()
 		self.page1.setT1(temperature)
-		s1 = float(self.metal_1[1])
-		s2 = float(self.metal_2[1])
-		voltage = self.model.calculateVoltage(s1, s2, temperature)
+		voltage = self.model.getVoltage(self.metal_1, self.metal_2, temperature)
+		self.temperature = temperature
+		self.voltage = voltage # Latest values, sampled by the data logger
 		self.page1.setVoltage(voltage)
-		self.page1.setMetal1(self.metal_1[0])
-		self.page1.setMetal2(self.metal_2[0])
+		self.page1.setMetal1(self.model.getName(self.metal_1))
+		self.page1.setMetal2(self.model.getName(self.metal_2))
 
 	def getElementOne(self, event):
 		"""
 		Callback function when selecting element one. Triggered by selecting an item from listbox 1
 		"""
 		index = self.page1.element_one.curselection()
-		self.metal_1 = self.page1.element_one[index]
+		self.metal_1 = index
 		self.calculateVoltage(0)
 
 	def getElementTwo(self, event):
@@ -70,11 +85,81 @@ class ThermocoupleController():
 		Callback function when selecting element two. Triggered by selecting an item from listbox 2
 		"""
 		index = self.page1.element_two.curselection()
-		self.metal_2 = self.page1.element_two[index]
+		self.metal_2 = index
 		self.calculateVoltage(0)
 
+	def toggleLogger(self, event):
+		"""
+		Callback function to start or stop the data logger. Triggered by the logger button
+		"""
+		if self.logger.running:
+			self.stopLogger()
+			return
+		self.setLoggerRate()
+		self.page1.showLogger()
+		self.logger.start()
+		self.loggerLoop()
+
+	def stopLogger(self):
+		"""
+		Stop the data logger and any recording, and show the thermocouple again
+		"""
+		self.logger.stop()
+		if self.loggerJob is not None:
+			self.page1.after_cancel(self.loggerJob)
+			self.loggerJob = None
+		self.page1.hideLogger()
+
+	def toggleRecording(self, event):
+		"""
+		Callback function to start or stop streaming the logged samples to a CSV file.
+		Triggered by the record button
+		"""
+		if not self.logger.running:
+			return
+		if self.logger.writer is not None:
+			self.logger.stopRecording()
+			self.page1.setRecording(False)
+			return
+		path = self.page1.askLogFile()
+		if not path:
+			return
+		try:
+			self.logger.startRecording(path)
+		except OSError as e:
+			self.page1.loggerStatus.config(text="Cannot record: "+str(e))
+			return
+		self.page1.setRecording(True)
+
+	def setLoggerRate(self, event=None):
+		"""
+		Callback function to change the logger rate. Triggered by the rate spinbox
+		"""
+		rate = self.page1.getRate()
+		if rate is not None and rate != self.logger.rate:
+			self.logger.setRate(rate)
+
+	def loggerLoop(self):
+		"""
+		Take the samples that came due and redraw the strip chart. Called every refreshRate ms
+		while the logger runs
+		"""
+		self.logger.sample(self.temperature, self.voltage)
+		writer = self.logger.writer
+		status = "%d samples at %g Hz" % (self.logger.ring.count, self.logger.rate)
+		if writer is not None:
+			status += ", %d written to %s" % (writer.written, writer.path)
+			if writer.dropped:
+				status += ", %d dropped" % writer.dropped
+			if writer.error is not None:
+				status += ", error: %s" % writer.error
+		self.page1.updateLogger(self.logger.ring.values(), self.logger.window(), status)
+		self.loggerJob = self.page1.after(self.refreshRate, self.loggerLoop)
+
 	def exitPage(self, event):
 		"""
 		Callback function for exiting the main page. Called when pressing the home button
 		"""
+		if self.logger.running:
+			self.stopLogger()
 		self.mainController.mainPage()
\ No newline at end of file
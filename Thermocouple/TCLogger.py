@@ -0,0 +1,149 @@
+'''
+Description: This file contains the data logger of the thermocouple page. T1 and the voltage are
+			sampled at a fixed rate into a ring buffer, so memory stays the same however long the
+			logger runs, and can be streamed to a CSV file by a background thread.
+'''
+import queue
+import threading
+import time
+import numpy as np
+from Misc.arrayHelpers import RingBuffer
+from Misc.Scheduling import AnimationClock
+
+COLUMNS = ('time (s)', 'T1 (C)', 'voltage (mV)')
+
+"""
+Write rows to a CSV file from a background thread. write() never waits: if the thread falls so
+far behind that the queue is full the rows are dropped and counted instead
+"""
+class CSVWriter():
+	def __init__(self, path, header=COLUMNS, maxChunks=256):
+		self.path = path
+		self.chunks = queue.Queue(maxChunks)
+		self.stopping = threading.Event()
+		self.written = 0	# Rows written to the file
+		self.dropped = 0	# Rows lost because the queue was full
+		self.error = None	# Error that stopped the thread
+		self.file = open(path, 'w', newline='') # Fails here, on the caller's thread, if the path is bad
+		self.file.write(",".join(header)+"\n")
+		self.thread = threading.Thread(target=self.run, name='csv-writer', daemon=True)
+		self.thread.start()
+
+	def write(self, rows):
+		"""
+		Queue rows to be written
+		"""
+		if self.error is not None or self.stopping.is_set():
+			self.dropped += len(rows)
+			return
+		try:
+			self.chunks.put_nowait(rows)
+		except queue.Full:
+			self.dropped += len(rows)
+
+	def run(self):
+		"""
+		Write queued rows until closed. Everything queued before close() is written
+		"""
+		try:
+			while True:
+				try:
+					rows = self.chunks.get(timeout=0.1)
+				except queue.Empty:
+					if self.stopping.is_set():
+						break
+					continue
+				np.savetxt(self.file, rows, delimiter=",", fmt="%.9g")
+				self.written += len(rows)
+		except Exception as e: # Any error stops the thread, keep it so the page can show it
+			self.error = e
+		finally:
+			self.file.close()
+
+	def close(self, wait=False):
+		"""
+		Stop the thread once the queue is empty. Only waits for it if wait is set
+		"""
+		self.stopping.set()
+		if wait:
+			self.thread.join()
+
+"""
+Samples T1 and the voltage at a fixed rate. sample() is called from the tkinter loop at any
+interval and adds every sample that came due since the last call
+"""
+class DataLogger():
+	def __init__(self, capacity=10000, rate=100, clock=time.perf_counter):
+		self.ring = RingBuffer(capacity, width=len(COLUMNS))
+		self.clockFunc = clock
+		self.running = False
+		self.writer = None
+		self.time = 0.0 # Time of the last sample, seconds since the logger started
+		self.setRate(rate)
+
+	def setRate(self, rate):
+		"""
+		Set the number of samples per second
+		"""
+		self.rate = rate
+		self.clock = AnimationClock(1/rate, self.clockFunc)
+		if self.running:
+			self.clock.start()
+
+	def window(self):
+		"""
+		Seconds of data the ring buffer holds at the current rate
+		"""
+		return len(self.ring.data)/self.rate
+
+	def start(self):
+		"""
+		Start logging from an empty buffer
+		"""
+		self.ring.clear()
+		self.time = 0.0
+		self.clock.start()
+		self.running = True
+
+	def stop(self, wait=False):
+		"""
+		Stop logging and recording. With wait, returns once every queued row is in the file
+		"""
+		self.running = False
+		self.stopRecording(wait)
+
+	def startRecording(self, path):
+		"""
+		Stream every new sample to a CSV file. Raises OSError if the file cannot be created
+		"""
+		self.stopRecording()
+		self.writer = CSVWriter(path)
+
+	def stopRecording(self, wait=False):
+		"""
+		Stop streaming samples. The writer finishes the queued rows in the background unless wait is set
+		"""
+		if self.writer is not None:
+			self.writer.close(wait)
+			self.writer = None
+
+	def sample(self, T1, voltage):
+		"""
+		Add the samples due since the last call, all with the current T1 and voltage. Returns the
+		number of samples due. After a long stall only the newest buffer full is kept
+		"""
+		if not self.running:
+			return 0
+		n = self.clock.tick()
+		if not n:
+			return 0
+		kept = min(n, len(self.ring.data))
+		rows = np.empty((kept, len(COLUMNS)))
+		rows[:, 0] = self.time+np.arange(n-kept+1, n+1)/self.rate
+		rows[:, 1] = T1
+		rows[:, 2] = voltage
+		self.time += n/self.rate
+		self.ring.extend(rows)
+		if self.writer is not None:
+			self.writer.write(rows)
+		return n
@@ -0,0 +1,154 @@
+'''
+Description: This file contains the table of thermocouple materials. The seedback coefficients are
+			parsed once into a float array and looked up by row or by name. The parsed table is
+			cached in a binary file in the user's cache folder and rebuilt whenever the text file changes.
+'''
+import hashlib
+import os
+import sys
+import tempfile
+import numpy as np
+
+# Text file with one <metal:seedbackcoef> per line, found relative to this package. A coefficient
+# that changes with temperature is written as polynomial coefficients c0,c1,c2.. lowest order first,
+# S(T) = c0 + c1*T + c2*T^2 + .. in uV/C with T in C
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seedbackCoef.txt")
+
+"""
+Table of materials and their seedback coefficients (uV/C). Rows keep the order of the text file.
+coefs[i] holds the polynomial coefficients of metal i, padded with zeros to the highest order
+"""
+class MaterialTable():
+	def __init__(self, names, coefs, labels=None):
+		self.names = list(names)
+		self.coefs = np.array(coefs, dtype=float)
+		if self.coefs.ndim == 1:
+			self.coefs = self.coefs[:, None] # Constant coefficients
+		if labels is None:
+			labels = [",".join("%g" % c for c in np.trim_zeros(row, 'b')) or "0" for row in self.coefs]
+		self.labels = list(labels) # Coefficients as written in the file
+		self.coefs.flags.writeable = False
+		self.index = {name: i for i, name in enumerate(self.names)}
+
+	def __len__(self):
+		return len(self.names)
+
+	def __contains__(self, name):
+		return name in self.index
+
+	def __getitem__(self, name):
+		"""
+		Get the seedback polynomial coefficients of a material by name
+		"""
+		return self.coefs[self.index[name]]
+
+	def rows(self):
+		"""
+		Get the table as a flat list [metal1, seedbackcoef1, metal2, seedbackcoef2..] of strings
+		"""
+		result = []
+		for name, label in zip(self.names, self.labels):
+			result.append(name)
+			result.append(label)
+		return result
+
+def parseTable(path=DATA_PATH):
+	"""
+	Parse the text file of materials. Blank lines are skipped
+	"""
+	names = []
+	coefs = []
+	labels = []
+	with open(path, 'r') as f:
+		for number, line in enumerate(f, 1):
+			line = line.strip()
+			if not line:
+				continue
+			name, sep, coef = line.rpartition(":")
+			try:
+				coefs.append([float(c) for c in coef.split(",")])
+			except ValueError:
+				sep = ""
+			if not sep or not name:
+				raise ValueError("%s line %d: expected <metal:seedbackcoef>, got %r" % (path, number, line))
+			names.append(name)
+			labels.append(coef.strip())
+	order = max((len(c) for c in coefs), default=1)
+	padded = np.zeros((len(coefs), order))
+	for i, c in enumerate(coefs):
+		padded[i, :len(c)] = c
+	return MaterialTable(names, padded, labels)
+
+def cacheDir():
+	"""
+	Per user folder for the files built at run time, MLS_CACHE_DIR if set. None if the folder
+	cannot be created, in which case nothing is cached
+	"""
+	path = os.environ.get('MLS_CACHE_DIR')
+	if not path:
+		if sys.platform.startswith('win'):
+			base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+		elif sys.platform == 'darwin':
+			base = os.path.expanduser('~/Library/Caches')
+		else:
+			base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+		path = os.path.join(base, 'MaterialsLabSimulator')
+	try:
+		os.makedirs(path, exist_ok=True)
+	except OSError:
+		return None
+	return path
+
+def cachePath(path):
+	"""
+	Path of the binary cache of a text file, None if there is no cache folder. The name includes
+	a hash of the full path so copies of the tool in different places do not share a cache
+	"""
+	folder = cacheDir()
+	if folder is None:
+		return None
+	name = os.path.splitext(os.path.basename(path))[0]
+	key = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+	return os.path.join(folder, "%s-%s.npz" % (name, key))
+
+def replaceFile(path, write):
+	"""
+	Create path by calling write with a file object open on a temporary file in the same folder,
+	then moving it into place, so readers never see a half written file. Raises OSError
+	"""
+	handle, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+	try:
+		with os.fdopen(handle, 'wb') as f:
+			write(f)
+		os.replace(temp, path)
+	except BaseException:
+		try:
+			os.remove(temp)
+		except OSError:
+			pass
+		raise
+
+def loadTable(path=DATA_PATH, cache=True):
+	"""
+	Load the table of materials. The binary cache is used if it was made from the text file as it
+	is now, otherwise the text file is parsed and the cache is rewritten
+	"""
+	stat = os.stat(path)
+	source = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+	binary = cachePath(path) if cache else None
+	if binary is not None:
+		try:
+			with np.load(binary) as saved:
+				if np.array_equal(saved['source'], source):
+					return MaterialTable(saved['names'].tolist(), saved['coefs'], saved['labels'].tolist())
+		except Exception:
+			pass # Missing, half written or unreadable cache, rebuild it
+
+	table = parseTable(path)
+	if binary is not None:
+		try:
+			replaceFile(binary, lambda f: np.savez(f, names=np.array(table.names, dtype=str),
+				coefs=table.coefs, labels=np.array(table.labels, dtype=str), source=source))
+		except OSError:
+			pass # Read only cache folder, parse the text file every time
+	return table
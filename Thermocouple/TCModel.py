@@ -2,6 +2,123 @@
 Description: This file contains the class for implementing the thermocouple model.
 Author: Andrew Lucentini :-)
 '''
+import glob
+import hashlib
+import os
+import numpy as np
+from Thermocouple.TCMaterials import loadTable, cacheDir, replaceFile
+
+# Whole degree temperatures of the T1 slider, the voltage table has one layer per temperature
+T_MIN = 25
+T_MAX = 1200
+
+def antiderivative(coefs):
+	"""
+	Coefficients of the antiderivatives of polynomials given one per row, lowest order first.
+	The antiderivatives are zero at T = 0
+	"""
+	coefs = np.array(coefs, dtype=float, ndmin=2)
+	result = np.zeros((coefs.shape[0], coefs.shape[1]+1))
+	result[:, 1:] = coefs/np.arange(1, coefs.shape[1]+1)
+	return result
+
+def horner(coefs, T):
+	"""
+	Evaluate polynomials given one per row, lowest order first, at every temperature of T using
+	Horner's method. Returns an array of shape (rows,)+T.shape
+	"""
+	coefs = np.array(coefs, dtype=float, ndmin=2)
+	T = np.asarray(T, dtype=float)
+	column = (-1,)+(1,)*T.ndim # Broadcast one coefficient per row against T
+	result = np.broadcast_to(coefs[:, -1].reshape(column), coefs.shape[:1]+T.shape).copy()
+	for k in range(coefs.shape[1]-2, -1, -1):
+		result *= T
+		result += coefs[:, k].reshape(column)
+	return result
+
+def padCoefficients(seedback_1, seedback_2):
+	"""
+	Stack two seedback coefficients (numbers or polynomial coefficients) into rows of equal length
+	"""
+	seedback_1 = np.atleast_1d(np.asarray(seedback_1, dtype=float))
+	seedback_2 = np.atleast_1d(np.asarray(seedback_2, dtype=float))
+	coefs = np.zeros((2, max(len(seedback_1), len(seedback_2))))
+	coefs[0, :len(seedback_1)] = seedback_1
+	coefs[1, :len(seedback_2)] = seedback_2
+	return coefs
+
+def thermocoupleEMF(seedback_1, seedback_2, T1, T2):
+	"""
+	Voltage across a thermocouple: minus the integral of S_1(T)-S_2(T) from T2 to T1, using the
+	closed form antiderivative. T1 can be an array of temperatures
+	"""
+	coefs = padCoefficients(seedback_1, seedback_2)
+	difference = antiderivative(coefs[0]-coefs[1])
+	return -(horner(difference, T1)[0]-horner(difference, T2)[0])
+
+def voltageTable(coefs, T2, temperatures, against=None, dtype=np.float64):
+	"""
+	Voltage across every pair of metals at every temperature, result[i, j, k] is the voltage of
+	metal i against metal j at temperatures[k]. coefs holds the seedback polynomial of each metal,
+	one per row. With against the metals j are those instead of coefs. float32 halves the size
+	for exports and overviews but changes the last digits shown on the voltmeter
+	"""
+	def integrals(coefs):
+		integral = antiderivative(coefs)
+		return horner(integral, temperatures)-horner(integral, T2)[:, None] # Integral of S_i from T2 to T
+	emf = integrals(coefs)
+	other = emf if against is None else integrals(against)
+	return (-(emf[:, None, :]-other[None, :, :])).astype(dtype, copy=False)
+
+def voltageCachePath(coefs, T2, temperatures, dtype=np.float64):
+	"""
+	Path of the voltage table file for these inputs in the user's cache folder, None if there is
+	no cache folder. The name changes whenever an input changes
+	"""
+	folder = cacheDir()
+	if folder is None:
+		return None
+	key = hashlib.sha1()
+	for part in (coefs, [T2], temperatures):
+		key.update(np.asarray(part, dtype=float).tobytes())
+	return os.path.join(folder, "voltages-%s-%s.npy" % (np.dtype(dtype).name, key.hexdigest()[:16]))
+
+def loadVoltageTable(coefs, T2, temperatures, cache=True, dtype=np.float64):
+	"""
+	Load the voltage table memory mapped from disk, computing and saving it first if there is no
+	table for these inputs. Older tables are removed. Falls back to memory without a writable cache
+	"""
+	coefs = np.array(coefs, dtype=float, ndmin=2)
+	shape = (len(coefs), len(coefs), len(temperatures))
+	dtype = np.dtype(dtype)
+	path = voltageCachePath(coefs, T2, temperatures, dtype) if cache else None
+	if path is None:
+		return voltageTable(coefs, T2, temperatures, dtype=dtype)
+	try:
+		table = np.load(path, mmap_mode='r')
+		if table.shape == shape and table.dtype == dtype:
+			return table
+	except Exception:
+		pass # No table yet, or a half written or unreadable one
+
+	chunk = max(1, (64 << 20)//max(1, dtype.itemsize*shape[1]*shape[2])) # Rows of metals per 64 MB
+	def write(f):
+		np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(dtype),
+			'fortran_order': False, 'shape': shape})
+		for start in range(0, shape[0], chunk):
+			stop = min(start+chunk, shape[0])
+			voltageTable(coefs[start:stop], T2, temperatures, against=coefs, dtype=dtype).tofile(f)
+	try:
+		replaceFile(path, write)
+	except OSError:
+		return voltageTable(coefs, T2, temperatures, dtype=dtype)
+	for old in glob.glob(os.path.join(os.path.dirname(path), "voltages-%s-*.npy" % dtype.name)):
+		if old != path:
+			try:
+				os.remove(old)
+			except OSError:
+				pass
+	return np.load(path, mmap_mode='r')
 
 """
 Thermocouple model. Used in thermocouple controller
@@ -9,6 +126,9 @@ Thermocouple model. Used in thermocouple controller
 class ThermocoupleModel():
 	def __init__(self):
 		self.T2 = 25 # T2 temperature in celcius
+		self.materials = loadTable() # Metals and their seedback coefficients
+		self.temperatures = np.arange(T_MIN, T_MAX+1)
+		self.voltages = loadVoltageTable(self.materials.coefs, self.T2, self.temperatures).view(np.ndarray) # Plain array view, indexing a memmap is slower
 
 	def getT2(self):
 		"""
@@ -18,22 +138,42 @@ class ThermocoupleModel():
 
 	def getData(self):
 		"""
-		Get seedback coefficients for metals. Each line of the data represents a metal and
-		seedback coefficient in the form <metal:seedbackcoef>. This function iterates through 
-		each line and returns a list in the form [metal1, seedbackcoef1, metal2, seedbackcoef2..]
+		Get seedback coefficients for metals as a list in the form
+		[metal1, seedbackcoef1, metal2, seedbackcoef2..]. Row i of the list is metal i of the table
+		"""
+		return self.materials.rows()
+
+	def getName(self, index):
+		"""
+		Get the name of metal number index
+		"""
+		return self.materials.names[index]
+
+	def getVoltage(self, metal_1, metal_2, T1):
+		"""
+		Voltage across the thermocouple made of metal numbers metal_1 and metal_2, looked up in the
+		voltage table. Temperatures between or outside the whole degrees of the table are calculated
+		"""
+		k = int(T1)-T_MIN
+		if k == T1-T_MIN and 0 <= k < len(self.temperatures):
+			return self.voltages.item(metal_1, metal_2, k)
+		coefs = self.materials.coefs
+		return self.calculateVoltage(coefs[metal_1], coefs[metal_2], T1)
+
+	def getCurve(self, metal_1, metal_2, temperatures):
+		"""
+		Voltage across the thermocouple made of metal numbers metal_1 and metal_2 at every
+		temperature of an array, calculated in one go
 		"""
-		f = open("Thermocouple/seedbackCoef.txt", 'r')
-		data = f.readlines()
-		f.close()
-		lol = [i.strip("\n").split(":") for i in data]
-		result = []
-		for i in lol:
-			for j in i:
-				result.append(j)
-		return result
+		coefs = self.materials.coefs
+		return thermocoupleEMF(coefs[metal_1], coefs[metal_2], temperatures, self.T2)
 
 	def calculateVoltage(self, seedback_1, seedback_2, T1):
 		"""
-		Formula for calculating voltage across thermocouple
+		Formula for calculating voltage across thermocouple. The seedback coefficients are numbers
+		or polynomial coefficients of S(T), lowest order first. T1 can be an array of temperatures
 		"""
-		return -(seedback_1-seedback_2)*(T1-self.T2)
\ No newline at end of file
+		if all(isinstance(v, (int, float)) for v in (seedback_1, seedback_2, T1)):
+			return -(seedback_1-seedback_2)*(T1-self.T2) # Constant coefficients
+		voltage = thermocoupleEMF(seedback_1, seedback_2, T1, self.T2)
+		return voltage.item() if voltage.ndim == 0 else voltage
\ No newline at end of file
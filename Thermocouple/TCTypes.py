@@ -0,0 +1,176 @@
+'''
+Description: This file contains the standard letter thermocouple types (K, J, T, E, N, R, S, B)
+			with the ITS-90 reference functions. Voltages are converted to temperatures and back
+			for whole NumPy arrays at once, so logs of real thermocouple readings can be processed
+			with the same code the simulator uses.
+'''
+import numpy as np
+from Thermocouple.TCModel import horner
+
+"""
+Thermocouple type defined by the ITS-90 reference function: a polynomial per temperature range
+giving the voltage (mV) against a 0 C reference junction, plus an exponential term for type K.
+Temperatures are in C
+"""
+class ThermocoupleType():
+	def __init__(self, name, ranges, exponential=None, inverseMin=None):
+		self.name = name
+		self.ranges = [(low, high, np.array(coefs, dtype=float)) for low, high, coefs in ranges]
+		self.exponential = exponential # (a0, a1, a2), adds a0*exp(a1*(t-a2)^2)
+		self.tmin = self.ranges[0][0]
+		self.tmax = self.ranges[-1][1]
+
+		# Table used to start the inverse. It starts at inverseMin where the voltage hardly changes
+		# with temperature at the bottom of the range (type B is flat and dips below zero near 21 C)
+		low = self.tmin if inverseMin is None else inverseMin
+		self.gridT = np.linspace(low, self.tmax, int(self.tmax-low)+1)
+		self.gridE = self.evaluate(self.gridT)
+
+	def __repr__(self):
+		return "ThermocoupleType(%r)" % self.name
+
+	def evaluate(self, t, derivative=False):
+		"""
+		Evaluate the reference function or its derivative. NaN outside the range of the type
+		"""
+		t = np.asarray(t, dtype=float)
+		result = np.full(t.shape, np.nan)
+		for i, (low, high, coefs) in enumerate(self.ranges):
+			last = i == len(self.ranges)-1
+			mask = (t >= low) & ((t <= high) if last else (t < high))
+			if not mask.any():
+				continue
+			if derivative:
+				coefs = coefs[1:]*np.arange(1, len(coefs))
+			result[mask] = horner(coefs, t[mask])[0]
+		if self.exponential is not None:
+			a0, a1, a2 = self.exponential
+			mask = t >= 0
+			x = t[mask]-a2
+			term = a0*np.exp(a1*x*x)
+			result[mask] += 2*a1*x*term if derivative else term
+		return result
+
+	def emf(self, t, reference=0.0):
+		"""
+		Voltage (mV) at temperatures t with the reference junction at reference (C)
+		"""
+		result = self.evaluate(t)
+		if reference != 0:
+			result -= self.evaluate(reference)
+		return result.item() if result.ndim == 0 else result
+
+	def seebeck(self, t):
+		"""
+		Seebeck coefficient dE/dt (uV/C) at temperatures t
+		"""
+		result = self.evaluate(t, derivative=True)*1000
+		return result.item() if result.ndim == 0 else result
+
+	def temperature(self, emf, reference=0.0, tolerance=1e-9, maxIterations=20):
+		"""
+		Temperatures (C) at voltages emf (mV) with the reference junction at reference (C).
+		Starts from the reference table and refines all values together with Newton's method.
+		NaN for voltages outside the range of the type, or below 250 C for type B
+		"""
+		emf = np.asarray(emf, dtype=float)
+		shape = emf.shape
+		emf = emf.ravel()
+		if reference != 0:
+			emf = emf+self.evaluate(reference)
+		inside = (emf >= self.gridE[0]) & (emf <= self.gridE[-1])
+		t = np.interp(emf, self.gridE, self.gridT)
+		active = np.flatnonzero(inside)
+		for _ in range(maxIterations):
+			if not active.size:
+				break
+			ta = t[active]
+			error = self.evaluate(ta)-emf[active]
+			slope = self.evaluate(ta, derivative=True)
+			step = error/slope
+			t[active] = np.clip(ta-step, self.gridT[0], self.tmax)
+			active = active[np.abs(step) > tolerance]
+		t[~inside] = np.nan
+		return t.item() if not shape else t.reshape(shape)
+
+# ITS-90 reference functions, coefficients c0, c1, c2.. of t in C giving mV
+TYPES = {
+	'K': ThermocoupleType('K', [
+		(-270.0, 0.0, [0.0, 0.394501280250E-01, 0.236223735980E-04, -0.328589067840E-06,
+			-0.499048287770E-08, -0.675090591730E-10, -0.574103274280E-12, -0.310888728940E-14,
+			-0.104516093650E-16, -0.198892668780E-19, -0.163226974860E-22]),
+		(0.0, 1372.0, [-0.176004136860E-01, 0.389212049750E-01, 0.185587700320E-04,
+			-0.994575928740E-07, 0.318409457190E-09, -0.560728448890E-12, 0.560750590590E-15,
+			-0.320207200030E-18, 0.971511471520E-22, -0.121047212750E-25]),
+		], exponential=(0.118597600000E+00, -0.118343200000E-03, 0.126968600000E+03)),
+	'J': ThermocoupleType('J', [
+		(-210.0, 760.0, [0.0, 0.503811878150E-01, 0.304758369300E-04, -0.856810657200E-07,
+			0.132281952950E-09, -0.170529583370E-12, 0.209480906970E-15, -0.125383953360E-18,
+			0.156317256970E-22]),
+		(760.0, 1200.0, [0.296456256810E+03, -0.149761277860E+01, 0.317871039240E-02,
+			-0.318476867010E-05, 0.157208190040E-08, -0.306913690560E-12]),
+		]),
+	'T': ThermocoupleType('T', [
+		(-270.0, 0.0, [0.0, 0.387481063640E-01, 0.441944343470E-04, 0.118443231050E-06,
+			0.200329735540E-07, 0.901380195590E-09, 0.226511565930E-10, 0.360711542050E-12,
+			0.384939398830E-14, 0.282135219250E-16, 0.142515947790E-18, 0.487686622860E-21,
+			0.107955392700E-23, 0.139450270620E-26, 0.797951539270E-30]),
+		(0.0, 400.0, [0.0, 0.387481063640E-01, 0.332922278800E-04, 0.206182434040E-06,
+			-0.218822568460E-08, 0.109968809280E-10, -0.308157587720E-13, 0.454791352900E-16,
+			-0.275129016730E-19]),
+		]),
+	'E': ThermocoupleType('E', [
+		(-270.0, 0.0, [0.0, 0.586655087080E-01, 0.454109771240E-04, -0.779980486860E-06,
+			-0.258001608430E-07, -0.594525830570E-09, -0.932140586670E-11, -0.102876055340E-12,
+			-0.803701236210E-15, -0.439794973910E-17, -0.164147763550E-19, -0.396736195160E-22,
+			-0.558273287210E-25, -0.346578420130E-28]),
+		(0.0, 1000.0, [0.0, 0.586655087100E-01, 0.450322755820E-04, 0.289084072120E-07,
+			-0.330568966520E-09, 0.650244032700E-12, -0.191974955040E-15, -0.125366004970E-17,
+			0.214892175690E-20, -0.143880417820E-23, 0.359608994810E-27]),
+		]),
+	'N': ThermocoupleType('N', [
+		(-270.0, 0.0, [0.0, 0.261591059620E-01, 0.109574842280E-04, -0.938411115540E-07,
+			-0.464120397590E-10, -0.263033577160E-11, -0.226534380030E-13, -0.760893007910E-16,
+			-0.934196678350E-19]),
+		(0.0, 1300.0, [0.0, 0.259293946010E-01, 0.157101418800E-04, 0.438256272370E-07,
+			-0.252611697940E-09, 0.643118193390E-12, -0.100634715190E-14, 0.997453389920E-18,
+			-0.608632456070E-21, 0.208492293390E-24, -0.306821961510E-28]),
+		]),
+	'R': ThermocoupleType('R', [
+		(-50.0, 1064.18, [0.0, 0.528961729765E-02, 0.139166589782E-04, -0.238855693017E-07,
+			0.356916001063E-10, -0.462347666298E-13, 0.500777441034E-16, -0.373105886191E-19,
+			0.157716482367E-22, -0.281038625251E-26]),
+		(1064.18, 1664.5, [0.295157925316E+01, -0.252061251332E-02, 0.159564501865E-04,
+			-0.764085947576E-08, 0.205305291024E-11, -0.293359668173E-15]),
+		(1664.5, 1768.1, [0.152232118209E+03, -0.268819888545E+00, 0.171280280471E-03,
+			-0.345895706453E-07, -0.934633971046E-14]),
+		]),
+	'S': ThermocoupleType('S', [
+		(-50.0, 1064.18, [0.0, 0.540313308631E-02, 0.125934289740E-04, -0.232477968689E-07,
+			0.322028823036E-10, -0.331465196389E-13, 0.255744251786E-16, -0.125068871393E-19,
+			0.271443176145E-23]),
+		(1064.18, 1664.5, [0.132900444085E+01, 0.334509311344E-02, 0.654805192818E-05,
+			-0.164856259209E-08, 0.129989605174E-13]),
+		(1664.5, 1768.1, [0.146628232636E+03, -0.258430516752E+00, 0.163693574641E-03,
+			-0.330439046987E-07, -0.943223690612E-14]),
+		]),
+	'B': ThermocoupleType('B', [
+		(0.0, 630.615, [0.0, -0.246508183460E-03, 0.590404211710E-05, -0.132579316360E-08,
+			0.156682919010E-11, -0.169445292400E-14, 0.629903470940E-18]),
+		(630.615, 1820.0, [-0.389381686210E+01, 0.285717474700E-01, -0.848851047850E-04,
+			0.157852801640E-06, -0.168353448640E-09, 0.111097940130E-12, -0.445154310330E-16,
+			0.989756408210E-20, -0.937913302890E-24]),
+		], inverseMin=250.0),
+}
+
+def emfFromTemperature(kind, t, reference=0.0):
+	"""
+	Voltage (mV) of a thermocouple of type kind ('K', 'J'..) at temperatures t (C)
+	"""
+	return TYPES[kind.upper()].emf(t, reference)
+
+def temperatureFromEmf(kind, emf, reference=0.0):
+	"""
+	Temperature (C) of a thermocouple of type kind ('K', 'J'..) at voltages emf (mV)
+	"""
+	return TYPES[kind.upper()].temperature(emf, reference)
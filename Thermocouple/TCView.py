@@ -6,7 +6,7 @@ import tkinter as tk
 from tkinter import ttk
 from itertools import cycle
 import Misc.Styling as st
-from PIL import ImageTk, Image
+from Misc.Assets import assets
 from Misc.helperFunctions import multiple
 
 """
@@ -83,8 +83,23 @@ class ThermocoupleView(tk.Frame):
 			resolution=1)
 		self.T1.grid(row=18, column=2, rowspan=2, columnspan=5, sticky='nesw')
 
+		# Data logger controls
+		self.loggerButton = ttk.Button(mainArea, text="Start Logger")
+		self.loggerButton.grid(row=18, column=8, rowspan=2, columnspan=2, sticky='nesw')
+		tk.Label(mainArea, text="Rate (Hz)", bg=st.INPUT_BG).grid(row=18, column=10, rowspan=2, columnspan=2, sticky='nesw')
+		self.rate = tk.Spinbox(mainArea, values=(10, 50, 100, 500, 1000), width=6, bg=st.INPUT_BG)
+		self.rate.delete(0, tk.END)
+		self.rate.insert(0, 100)
+		self.rate.grid(row=18, column=12, rowspan=2, columnspan=2, sticky='nesw')
+		self.recordButton = ttk.Button(mainArea, text="Record CSV", state='disabled')
+		self.recordButton.grid(row=18, column=14, rowspan=2, columnspan=2, sticky='nesw')
+		self.loggerStatus = tk.Label(mainArea, text='', bg=st.MAIN_AREA_BG, anchor='w')
+		self.loggerStatus.grid(row=8, column=3, columnspan=14, sticky='nesw')
+		self.mainArea = mainArea
+		self.stripChart = None # Built the first time the logger is shown
+
 		# Draw mac logo
-		logoImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"macLogo.png"))
+		logoImg = assets.photo("macLogo.png")
 		canvas = tk.Canvas(mainArea, bg=st.MAIN_AREA_BG, width=130, height=71, bd=0, highlightthickness=0, relief='ridge')
 		canvas.create_image(130/2,71/2, image=logoImg, anchor = "center")
 		canvas.image = logoImg
@@ -128,17 +143,134 @@ class ThermocoupleView(tk.Frame):
 		self.metal_2_text = self.canvas.create_text(self.width/2-50,self.height/2+gap_width, anchor="center", text='', fill = 'white')
 
 		# Create voltmeter
-		self.voltmeterImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"voltmeter.png"))
+		self.voltmeterImg = assets.photo("voltmeter.png")
 		self.canvas.create_image(end+150,self.height/2, image=self.voltmeterImg)
 		self.canvas.image = self.voltmeterImg
 
 		# Create wires
-		self.wiresImg = ImageTk.PhotoImage(Image.open(st.IMG_PATH+"wires.png"))
+		self.wiresImg = assets.photo("wires.png")
 		self.canvas.create_image(end-12,self.height/2-60, image=self.wiresImg, anchor='nw')
 		self.canvas.image = self.wiresImg
 
 		# Text for displaying voltage
 		self.voltage_text = self.canvas.create_text(end+185,self.height/2-gap_width, anchor="e", text='')
+
+	def showLogger(self):
+		"""
+		Replace the thermocouple drawing with the strip chart of the data logger
+		"""
+		if self.stripChart is None:
+			self.stripChart = StripChart(self.mainArea, self.width, self.height)
+		self.canvas.grid_remove()
+		self.stripChart.widget.grid(row = 9, column=3, columnspan=14,  rowspan=9, sticky='nw')
+		self.stripChart.reset()
+		self.loggerButton.config(text="Stop Logger")
+		self.recordButton.config(state='normal')
+
+	def hideLogger(self):
+		"""
+		Show the thermocouple drawing again
+		"""
+		if self.stripChart is not None:
+			self.stripChart.widget.grid_remove()
+		self.canvas.grid()
+		self.loggerButton.config(text="Start Logger")
+		self.recordButton.config(text="Record CSV", state='disabled')
+		self.loggerStatus.config(text='')
+
+	def setRecording(self, recording):
+		"""
+		Set the text of the record button
+		"""
+		self.recordButton.config(text="Stop Recording" if recording else "Record CSV")
+
+	def askLogFile(self):
+		"""
+		Ask where to save the logged samples. Returns an empty string if cancelled
+		"""
+		from tkinter import filedialog
+		return filedialog.asksaveasfilename(parent=self, defaultextension=".csv",
+			filetypes=[("CSV files", "*.csv")], title="Record logger data")
+
+	def getRate(self):
+		"""
+		Get the logger rate in Hz, None if the text is not a positive number
+		"""
+		try:
+			rate = float(self.rate.get())
+		except ValueError:
+			return None
+		return rate if rate > 0 else None
+
+	def updateLogger(self, samples, window, status):
+		"""
+		Draw the logged samples (rows of time, T1, voltage) and the logger status
+		"""
+		self.stripChart.update(samples[:, 0], samples[:, 2], window)
+		self.loggerStatus.config(text=status)
+
+"""
+Class for drawing the data logger strip chart. The newest sample is at time 0 and the axes only
+change when the voltage leaves them, so each frame just redraws the line over a saved background
+"""
+class StripChart():
+	def __init__(self, master, width, height, maxPoints=2000):
+		from matplotlib.figure import Figure
+		from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+		self.maxPoints = maxPoints # Points drawn at most, the samples are thinned out beyond that
+		self.f = Figure(figsize=(width/100, height/100), dpi=100)
+		self.a = self.f.add_subplot(111)
+		self.a.grid(color='grey', linestyle='-', linewidth=0.3)
+		self.a.set_xlabel('Time (s)')
+		self.a.set_ylabel('Voltage (mV)')
+		self.f.subplots_adjust(left=0.12, right=0.97, top=0.95, bottom=0.17)
+		self.line = self.a.plot([],[],"-", animated=True)[0]
+		self.graphWindow = FigureCanvasTkAgg(self.f, master)
+		self.graphWindow.mpl_connect('draw_event', self.saveBackground)
+		self.widget = self.graphWindow.get_tk_widget()
+		self.background = None
+		self.ylim = None
+
+	def saveBackground(self, event):
+		"""
+		Save the axes without the line after every full draw
+		"""
+		self.background = self.graphWindow.copy_from_bbox(self.a.bbox)
+
+	def reset(self):
+		"""
+		Forget the voltage range of the last run
+		"""
+		self.ylim = None
+		self.line.set_data([],[])
+		self.background = None
+
+	def update(self, times, voltages, window):
+		"""
+		Draw the voltage against time. Only the line is redrawn unless the axes have to change
+		"""
+		if not len(times):
+			return
+		redraw = self.background is None
+		if self.a.get_xlim() != (-window, 0):
+			self.a.set_xlim(-window, 0)
+			redraw = True
+		low, high = voltages.min(), voltages.max()
+		if self.ylim is None or low < self.ylim[0] or high > self.ylim[1]:
+			margin = max(1.0, 0.1*(high-low), 0.05*max(abs(low), abs(high)))
+			self.ylim = (low-margin, high+margin)
+			self.a.set_ylim(self.ylim)
+			redraw = True
+
+		step = -(-len(times)//self.maxPoints) # Ceiling division
+		keep = slice(len(times)-1 - (len(times)-1)//step*step, None, step) # Always keep the newest sample
+		self.line.set_data(times[keep]-times[-1], voltages[keep])
+		if redraw:
+			self.graphWindow.draw()
+		else:
+			self.graphWindow.restore_region(self.background)
+		self.a.draw_artist(self.line)
+		self.graphWindow.blit(self.a.bbox)
 	
 	def populateListboxes(self, data):
 		"""
@@ -1,10 +1,116 @@
-from MainController import MainController
+import argparse
+import os
+import time
 
-# Run this function to run the simulation
-def main():
+def runGUI(args):
+		"""
+		Run the simulation tool
+		"""
+		if args.frame_log:
+			os.environ['MLS_FRAME_LOG'] = args.frame_log
+		if args.trace:
+			os.environ['MLS_TRACE'] = args.trace
+		if args.roll_duration:
+			os.environ['MLS_ROLL_DURATION'] = str(args.roll_duration)
+		if args.tensile_duration:
+			os.environ['MLS_TENSILE_DURATION'] = str(args.tensile_duration)
+		if args.startup_profile:
+			from Misc.Startup import startupProfile
+			startupProfile(os.path.abspath(__file__))
+			return
+		start = time.perf_counter()
+		from MainController import MainController
 		app = MainController()
 		app.geometry("1000x700")
 		app.resizable(False, False)
+		if args.startup_profile_child:
+			app.update()
+			print("Time to first window: %.1f ms" % ((time.perf_counter()-start)*1000))
+			app.destroy()
+			return
 		app.mainloop()
+		if args.asset_report:
+			from Misc.Assets import assets
+			print(assets.report())
+
+def runSimulation(args):
+		"""
+		Run the cold roller and tensile test without a display
+		"""
+		from MechanicalWorkshop.MWHeadless import simulate, saveSimulation
+		try:
+			result = simulate(args.t0, args.tf, tolerance=args.tolerance)
+		except ValueError as e:
+			raise SystemExit("Error: "+str(e))
+		if args.out:
+			saveSimulation(result, args.out)
+		print("CW = %s%%, YS = %.2f MPa, UTS = %.2f MPa, EL = %.4f" % (result.CW, result.YS, result.UTS, result.EL))
+
+def runBenchmark(args):
+		"""
+		Run the benchmark suite and compare it to a baseline
+		"""
+		from Misc.Benchmark import runBenchmarks, compareResults, saveResults, loadResults
+		results = runBenchmarks(stub=args.stub, imports=not args.no_imports, repeat=args.repeat)
+		for name, ms in sorted(results['metrics'].items()):
+			print("%-40s %10.4f ms" % (name, ms))
+		if args.out:
+			saveResults(results, args.out)
+		if args.baseline:
+			try:
+				regressions = compareResults(results, loadResults(args.baseline), args.threshold, args.noise)
+			except ValueError as e:
+				raise SystemExit("Error: "+str(e))
+			for name, old, new in regressions:
+				print("REGRESSION %s: %.4f ms -> %.4f ms (+%.0f%%)" % (name, old, new, (new/old-1)*100))
+			if regressions:
+				raise SystemExit(1)
+
+def positiveFloat(text):
+		"""
+		Argument type for durations, a number greater than 0
+		"""
+		value = float(text)
+		if not value > 0:
+			raise argparse.ArgumentTypeError("must be greater than 0, got %s" % text)
+		return value
+
+def parseArgs(argv=None):
+		"""
+		Parse the command line. Without a subcommand the simulation tool is started
+		"""
+		parser = argparse.ArgumentParser(description="Materials Lab Simulation Tool")
+		parser.set_defaults(func=runGUI)
+		parser.add_argument("--frame-log", help="write per-frame animation timings to this CSV file on exit")
+		parser.add_argument("--roll-duration", type=positiveFloat, help="make the cold rolling animation take this many seconds")
+		parser.add_argument("--tensile-duration", type=positiveFloat, help="make the tensile test animation take this many seconds")
+		parser.add_argument("--trace", help="write a Chrome trace of the controller callbacks to this JSON file on exit")
+		parser.add_argument("--startup-profile", action="store_true", help="report the import time of each module at startup")
+		parser.add_argument("--asset-report", action="store_true", help="print the memory used by each cached image on exit")
+		parser.add_argument("--startup-profile-child", action="store_true", help=argparse.SUPPRESS)
+		subparsers = parser.add_subparsers(title="commands")
+
+		sim = subparsers.add_parser("simulate", help="cold roll and tensile test a sheet without the GUI")
+		sim.add_argument("--t0", type=float, required=True, help="initial thickness (mm)")
+		sim.add_argument("--tf", type=float, required=True, help="final thickness (mm)")
+		sim.add_argument("--out", help="CSV file to write the tensile curve to")
+		sim.add_argument("--tolerance", type=float, help="sample the curve adaptively to this max stress error (MPa)")
+		sim.set_defaults(func=runSimulation)
+
+		bench = subparsers.add_parser("benchmark", help="time imports, page construction, model calls and animation frames")
+		bench.add_argument("--out", help="JSON file to write the results to")
+		bench.add_argument("--baseline", help="JSON results of an earlier run, exit with an error if a metric got slower")
+		bench.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a metric counts as a regression (default 0.25)")
+		bench.add_argument("--noise", type=float, default=0.005, help="slowdowns of at most this many ms are never regressions (default 0.005)")
+		bench.add_argument("--repeat", type=int, default=5, help="number of runs of each benchmark, the median is reported")
+		bench.add_argument("--stub", action="store_true", help="record canvas calls instead of using the display")
+		bench.add_argument("--no-imports", action="store_true", help="skip the import time benchmarks")
+		bench.set_defaults(func=runBenchmark)
+		return parser.parse_args(argv)
+
+# Run this function to run the simulation
+def main(argv=None):
+		args = parseArgs(argv)
+		args.func(args)
 if __name__ == '__main__':
         main()